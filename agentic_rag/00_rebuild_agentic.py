@@ -1,17 +1,16 @@
 #!/usr/bin/env python3
 """Orchestrateur principal pour le système RAG agentic."""
 
+import asyncio
+import importlib.util
 import logging
-import subprocess
 import sys
 from pathlib import Path
 
 # Configurer l'encodage UTF-8 pour la sortie standard
 if sys.platform == 'win32':
-    import io
-
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
 # Configuration du logging
 logging.basicConfig(
@@ -24,6 +23,10 @@ logger = logging.getLogger(__name__)
 def run_phase(phase_number: int, script_name: str) -> int:
     """Exécute une phase du pipeline.
 
+    Le script est chargé et son `main()` appelé dans ce processus : pas de
+    nouvel interpréteur par phase, et les dépendances lourdes (langchain,
+    chromadb...) déjà importées par une phase précédente sont réutilisées.
+
     Args:
         phase_number: Numéro de la phase.
         script_name: Nom du script à exécuter.
@@ -38,20 +41,32 @@ def run_phase(phase_number: int, script_name: str) -> int:
     script_path = Path(__file__).parent / script_name
 
     try:
-        # Execute as a script file, not as a module
-        result = subprocess.run(
-            ['uv', 'run', 'python', str(script_path)],
-            cwd=Path(__file__).parent.parent,
-            capture_output=False,
+        # Les noms des scripts commencent par un chiffre : chargement par
+        # chemin plutôt que par import
+        spec = importlib.util.spec_from_file_location(
+            f'phase_{phase_number}', script_path
         )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        returncode = module.main()
+        # Phase 1 (crawl4ai) expose un main() asynchrone
+        if asyncio.iscoroutine(returncode):
+            returncode = asyncio.run(returncode)
     except FileNotFoundError:
         logger.error(f'Script non trouvé: {script_path}')
         return 1
+    except SystemExit as e:
+        # Certains scripts appellent sys.exit() en cas d'erreur
+        returncode = e.code if e.code is None or isinstance(e.code, int) else 1
     except Exception as e:
-        logger.error(f"Erreur lors de l'exécution du script: {e}")
+        logger.exception(f"Erreur lors de l'exécution du script: {e}")
         return 1
+    finally:
+        # Les phases écrivent sur stdout : tout afficher avant la validation
+        sys.stdout.flush()
 
-    if result.returncode != 0:
+    if returncode:
         print(f'\n❌ Phase {phase_number} échouée!')
         return 1
 
@@ -20,10 +20,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Configurer l'encodage UTF-8 pour stdout
 if sys.platform == 'win32':
-    import io
-
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
@@ -6,7 +6,6 @@ Utilise un retriever direct au lieu du graphe LangGraph complet pour être plus
 """
 
 import argparse
-import io
 import json
 import sys
 import time
@@ -14,8 +13,8 @@ from pathlib import Path
 
 # Fix encoding Windows
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
 # Ajouter le répertoire parent au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
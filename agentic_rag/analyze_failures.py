@@ -5,14 +5,13 @@ Analyze benchmark failures to identify patterns and missing keywords.
 
 import json
 import sys
-import io
 from collections import defaultdict
 from pathlib import Path
 from charset_normalizer import detect
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 # Load results
 results_file = Path(__file__).parent / 'BENCHMARK_LANGGRAPH_92.json'
@@ -1,6 +1,7 @@
 """Interface de chat Gradio pour le système RAG agentic."""
 
 import json
+import time
 from datetime import datetime
 
 import gradio as gr
@@ -20,6 +21,9 @@ class ChatInterface:
         "Qu'est-ce que le multiplexer dans HAProxy 3.2 ?",
     ]
 
+    # Intervalle minimal entre deux rafraîchissements du streaming (20 Hz max)
+    STREAM_MIN_INTERVAL = 0.05
+
     def __init__(self) -> None:
         """Initialise l'interface de chat."""
         self.rag_system = AgenticRAGSystem()
@@ -50,12 +54,23 @@ class ChatInterface:
             # Initialiser le texte des sources
             sources_text = '**Sources utilisées:**\n\n'
             
-            # Construire la réponse avec streaming
-            response = ''
+            # Construire la réponse avec streaming. Chaque yield fait re-rendre
+            # tout le chatbot : au plus un rafraîchissement toutes les
+            # STREAM_MIN_INTERVAL secondes, les chunks intermédiaires sont
+            # accumulés
+            parts: list[str] = []
+            last_emit = 0.0
             for chunk in self.rag_system.query(self.current_session_id, message):
-                response += chunk
-                history[-1] = {'role': 'assistant', 'content': response}
-                yield '', history, sources_text + 'Chargement...', f'Génération en cours... ({len(response)} caractères)'
+                parts.append(chunk)
+                now = time.monotonic()
+                if now - last_emit >= self.STREAM_MIN_INTERVAL:
+                    last_emit = now
+                    response = ''.join(parts)
+                    history[-1] = {'role': 'assistant', 'content': response}
+                    yield '', history, sources_text + 'Chargement...', f'Génération en cours... ({len(response)} caractères)'
+
+            response = ''.join(parts)
+            history[-1] = {'role': 'assistant', 'content': response}
             
             # Récupérer les sources
             try:
@@ -14,7 +14,6 @@ Usage:
 """
 
 import argparse
-import io
 import json
 import os
 import sys
@@ -23,8 +22,8 @@ from pathlib import Path
 
 # Fix encoding Windows
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
 import requests
 
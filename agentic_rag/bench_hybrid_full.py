@@ -7,13 +7,12 @@ Sauvegarde les résultats dans un fichier JSON pour analyse.
 
 import json
 import sys
-import io
 import time
 from pathlib import Path
 from datetime import datetime
 
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -14,6 +14,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config_agentic import DATA_DIR, SCRAPED_PAGES_PATH
 
+# orjson (optionnel) : parsing JSONL plus rapide, directement depuis les octets
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class ReferenceComparator:
     """
@@ -174,12 +182,13 @@ class ReferenceComparator:
 
         # Charger JSONL ou JSON
         if file_path.suffix == '.jsonl':
-            with open(file_path, encoding='utf-8') as f:
+            # Lecture binaire : chaque ligne est parsée sans décodage préalable
+            with open(file_path, 'rb') as f:
                 for line in f:
                     if line.strip():
                         try:
-                            documents.append(json.loads(line))
-                        except json.JSONDecodeError:
+                            documents.append(_json_loads(line))
+                        except ValueError:
                             # Ignorer les lignes corrompues et continuer
                             continue
         elif file_path.suffix == '.json':
@@ -7,11 +7,15 @@ Ce module extrait la documentation HAProxy depuis le site officiel.
 import json
 import logging
 import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from agentic_rag.config_agentic import DATA_DIR, SCRAPER_CONFIG
 
@@ -25,6 +29,12 @@ logger = logging.getLogger(__name__)
 MIN_CONTENT_LENGTH = 50  # Contenu trop court = ignoré
 SHORT_CONTENT_LENGTH = 200  # Contenu court = warning
 
+# Pool de connexions HTTP (un seul hôte : docs.haproxy.org)
+POOL_MAXSIZE = 32
+MAX_RETRIES = 3
+# Téléchargements simultanés (en avance sur le parsing)
+FETCH_WORKERS = 8
+
 
 class HAProxyScraper:
     """
@@ -54,12 +64,61 @@ class HAProxyScraper:
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                'User-Agent': SCRAPER_CONFIG['user_agent'],
-            }
+        # Connexions TCP/TLS réutilisées d'une page à l'autre, avec reprise
+        # automatique sur les erreurs transitoires (5xx, 429, coupures).
+        # L'adaptateur (pool urllib3, thread-safe) est partagé par toutes les
+        # sessions ; chaque thread de téléchargement a sa propre session
+        # (requests.Session n'est pas garanti thread-safe : cookies, état)
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=Retry(
+                total=MAX_RETRIES,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
         )
+        self._sessions: list[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._local = threading.local()
+        self.session = self._get_session()
+
+    def _get_session(self) -> requests.Session:
+        """
+        Retourne la session HTTP du thread courant (créée au premier appel).
+
+        Returns:
+            Session propre au thread, montée sur l'adaptateur partagé.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(
+                {
+                    'User-Agent': SCRAPER_CONFIG['user_agent'],
+                }
+            )
+            session.mount('http://', self._adapter)
+            session.mount('https://', self._adapter)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        """
+        Ferme les sessions HTTP et libère les connexions du pool.
+        """
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> 'HAProxyScraper':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def scrape_all_pages(self) -> list[dict[str, Any]]:
         """
@@ -95,7 +154,7 @@ class HAProxyScraper:
             logger.debug(f'  - {link}')
 
         # Scraper la page d'index (intro.html)
-        index_docs = self.scrape_page_with_sections(index_url)
+        index_docs = self._extract_sections(index_url, soup)
         if index_docs:
             documents.extend(index_docs)
             logger.info(f"  - {len(index_docs)} sections extraites de la page d'index")
@@ -104,34 +163,48 @@ class HAProxyScraper:
         url_queue.extend(links)
         visited_urls.add(index_url)
 
-        # Scraper chaque page de manière récursive (BFS)
-        while url_queue and len(documents) < SCRAPER_CONFIG['max_pages']:
-            url = url_queue.pop(0)
-
-            # Normaliser l'URL (supprimer l'ancre pour la déduplication)
-            url_normalized = self._normalize_url(url)
-
-            # Ignorer si déjà visité
-            if url_normalized in visited_urls:
-                logger.debug(f'URL déjà visitée: {url}')
-                continue
+        # Scraper chaque page de manière récursive (BFS). Les pages en tête de
+        # file sont téléchargées en avance dans un pool de threads (même
+        # session) ; le parsing reste séquentiel, dans l'ordre de la file
+        prefetched: dict[str, Future[str]] = {}
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            while url_queue and len(documents) < SCRAPER_CONFIG['max_pages']:
+                self._prefetch(pool, url_queue, visited_urls, prefetched)
+                url = url_queue.pop(0)
+
+                # Normaliser l'URL (supprimer l'ancre pour la déduplication)
+                url_normalized = self._normalize_url(url)
+
+                # Ignorer si déjà visité
+                if url_normalized in visited_urls:
+                    logger.debug(f'URL déjà visitée: {url}')
+                    continue
 
-            # Marquer comme visité
-            visited_urls.add(url_normalized)
+                # Marquer comme visité
+                visited_urls.add(url_normalized)
 
-            logger.info(f'Scraping de la page {len(documents) + 1}: {url}')
+                logger.info(f'Scraping de la page {len(documents) + 1}: {url}')
 
-            # Scraper la page et extraire les sections avec ancres
-            page_docs = self.scrape_page_with_sections(url)
-            if page_docs:
-                documents.extend(page_docs)
+                try:
+                    html = prefetched.pop(url_normalized).result()
+                except Exception as e:
+                    logger.error(f'Erreur lors du scraping de {url}: {e}')
+                    continue
 
-                # Extraire les liens de cette page et les ajouter à la file d'attente
+                # Extraire les liens avant les sections : l'extraction du
+                # contenu supprime la navigation (decompose) de la soup
+                soup = BeautifulSoup(html, 'html.parser')
+                page_base_url = url.rsplit('/', 1)[0] + '/'
                 try:
-                    page_html = self._fetch_page(url)
-                    page_soup = BeautifulSoup(page_html, 'html.parser')
-                    page_base_url = url.rsplit('/', 1)[0] + '/'
-                    page_links = self._extract_links(page_soup, page_base_url)
+                    page_links = self._extract_links(soup, page_base_url)
+                except Exception as e:
+                    logger.warning(f"Erreur lors de l'extraction des liens de {url}: {e}")
+                    page_links = []
+
+                # Extraire les sections avec ancres
+                page_docs = self._extract_sections(url, soup)
+                if page_docs:
+                    documents.extend(page_docs)
 
                     # Ajouter les nouveaux liens à la file d'attente
                     for link in page_links:
@@ -140,8 +213,10 @@ class HAProxyScraper:
                             url_queue.append(link)
 
                     logger.debug(f'  - {len(page_links)} liens trouvés sur cette page')
-                except Exception as e:
-                    logger.warning(f"Erreur lors de l'extraction des liens de {url}: {e}")
+
+            # Limite atteinte : abandonner les téléchargements pas encore lancés
+            for future in prefetched.values():
+                future.cancel()
 
         # Sauvegarder les documents
         if documents:
@@ -164,6 +239,30 @@ class HAProxyScraper:
             return url.split('#')[0]
         return url
 
+    def _prefetch(
+        self,
+        pool: ThreadPoolExecutor,
+        url_queue: list[str],
+        visited_urls: set[str],
+        prefetched: dict[str, Future[str]],
+    ) -> None:
+        """
+        Lance le téléchargement des prochaines pages de la file d'attente.
+
+        Args:
+            pool: Pool de threads utilisé pour les téléchargements.
+            url_queue: File d'attente des URLs à scraper.
+            visited_urls: URLs (normalisées) déjà traitées.
+            prefetched: Téléchargements en cours, par URL normalisée.
+        """
+        for url in url_queue:
+            if len(prefetched) >= FETCH_WORKERS * 2:
+                break
+            url_normalized = self._normalize_url(url)
+            if url_normalized in visited_urls or url_normalized in prefetched:
+                continue
+            prefetched[url_normalized] = pool.submit(self._fetch_page, url)
+
     def _fetch_page(self, url: str) -> str:
         """
         Récupère le contenu d'une page.
@@ -174,7 +273,7 @@ class HAProxyScraper:
         Returns:
             Contenu HTML de la page.
         """
-        response = self.session.get(url, timeout=SCRAPER_CONFIG['timeout'])
+        response = self._get_session().get(url, timeout=SCRAPER_CONFIG['timeout'])
         response.raise_for_status()
         return response.text
 
@@ -292,7 +391,19 @@ class HAProxyScraper:
             return []
 
         soup = BeautifulSoup(html, 'html.parser')
+        return self._extract_sections(url, soup)
+
+    def _extract_sections(self, url: str, soup: BeautifulSoup) -> list[dict[str, Any]]:
+        """
+        Extrait toutes les sections avec ancres d'une page déjà parsée.
 
+        Args:
+            url: URL de la page.
+            soup: Page parsée.
+
+        Returns:
+            Liste de documents scrapés (un par section).
+        """
         # Extraire toutes les ancres de la page
         anchors = self._extract_anchors(soup)
 
@@ -692,8 +803,8 @@ def main() -> None:
     """
     Point d'entrée principal.
     """
-    scraper = HAProxyScraper()
-    documents = scraper.scrape()
+    with HAProxyScraper() as scraper:
+        documents = scraper.scrape()
     print(f'Documents scrapés: {len(documents)}')
 
 
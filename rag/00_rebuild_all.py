@@ -13,6 +13,8 @@ Ce script :
 5. Tester avec le benchmark
 """
 
+import argparse
+import os
 import subprocess
 import time
 from datetime import datetime
@@ -33,11 +35,15 @@ def run_script(script_name, description, extra_args=None):
     print("-" * 70)
 
     # Exécution avec affichage en temps réel
+    # PYTHONUNBUFFERED : sans lui, l'enfant bufferise par blocs dès que la
+    # sortie n'est pas un terminal (ex: `... | tee rebuild.log`) et les logs
+    # n'apparaissent qu'à la fin de l'étape
     start_time = time.time()
     process = subprocess.Popen(
         cmd,
         stdout=None,  # Afficher directement dans la console
         stderr=None,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
     )
 
     process.wait()
@@ -53,8 +59,6 @@ def run_script(script_name, description, extra_args=None):
 
 
 def main():
-    import argparse
-
     parser = argparse.ArgumentParser(description="Rebuild entire RAG pipeline")
     parser.add_argument(
         "--no-benchmark", action="store_true", help="Skip benchmark step"
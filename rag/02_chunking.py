@@ -15,14 +15,13 @@ Features :
 import json
 import re
 import sys
-import io
 from pathlib import Path
 from typing import Optional
 
 # Fix encoding Windows
 if sys.platform == "win32":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
 
 # ── Constantes ──────────────────────────────────────────────────────────────
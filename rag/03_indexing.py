@@ -306,10 +306,9 @@ def main():
     """Script principal."""
     # Fix encoding Windows
     import sys
-    import io
     if sys.platform == "win32":
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+        sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+        sys.stderr.reconfigure(encoding="utf-8", errors="replace")
     
     print("=" * 70)
     print("[INFO] Indexation V3 - HAProxy RAG")
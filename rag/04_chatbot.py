@@ -4,30 +4,38 @@
 Architecture modulaire avec Gradio 6.x
 """
 
+import argparse
 import sys
-import io
+import threading
+import traceback
 from pathlib import Path
 
-from app.ui.styles import CUSTOM_CSS
-
 # Fix Windows encoding
 if sys.platform == "win32":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.main import create_app
+from config import chatbot_config, ollama_config
 from app.utils.logging import setup_logging
 
 logger = setup_logging(__name__, log_file="gradio_app.log")
 
 
+def _warmup_models() -> None:
+    """Précharge le LLM par défaut et le modèle d'embedding dans Ollama."""
+    from config import llm_config
+    from llm import warmup_model
+    from retriever_v3 import warmup_embedding_model
+
+    warmup_embedding_model()
+    warmup_model(llm_config.default_model)
+
+
 def main():
     """Point d'entrée principal."""
-    import argparse
-
     parser = argparse.ArgumentParser(
         description="HAProxy RAG Chatbot - Architecture Modulaire"
     )
@@ -36,11 +44,25 @@ def main():
     parser.add_argument("--share", action="store_true", help="Share")
     args = parser.parse_args()
 
+    # Précharger les modèles Ollama en parallèle : le premier tour ne paie
+    # plus le chargement à froid du modèle depuis le disque
+    threading.Thread(target=_warmup_models, name="model-warmup", daemon=True).start()
+
+    # Gradio (FastAPI, uvicorn...) et l'application ne sont importés qu'une
+    # fois les arguments validés : `--help` répond sans ce coût d'import
+    from app.main import create_app
+    from app.ui.styles import CUSTOM_CSS
+
     print("\n" + "=" * 60)
     print("  🔧 HAProxy 3.2 Documentation Assistant")
     print("  Architecture Modulaire V2")
     print("=" * 60)
     print(f"  URL: http://{args.host}:{args.port}")
+    print(f"  Ollama: {ollama_config.url}")
+    print(
+        f"  Générations parallèles: {chatbot_config.generation_concurrency}"
+        f" (ollama serve avec OLLAMA_NUM_PARALLEL={ollama_config.num_parallel})"
+    )
     print("=" * 60 + "\n")
 
     try:
@@ -54,8 +76,6 @@ def main():
     except Exception as e:
         logger.critical("Critical error: %s", e)
         print(f"\n❌ {e}")
-        import traceback
-
         traceback.print_exc()
         sys.exit(1)
 
@@ -16,31 +16,51 @@ Usage:
 
     # Modèle personnalisé
     uv run python 05_bench_targeted.py --level quick --model qwen3:latest
+
+    # Questions traitées en parallèle (défaut: OLLAMA_NUM_PARALLEL)
+    uv run python 05_bench_targeted.py --level full --concurrency 8
+
+    # Sans cache de retrieval (force le pipeline complet)
+    uv run python 05_bench_targeted.py --level quick --no-cache
+
+Les contextes de retrieval sont mis en cache (mémoire + SQLite, cf.
+retrieval_cache.py, cache exact uniquement) : les exécutions suivantes, par
+exemple pour comparer des modèles LLM, ne refont pas le retrieval. Le cache
+est invalidé automatiquement quand les index sont reconstruits.
 """
 
 import argparse
+import asyncio
 import json
 import sys
-import io
 import time
-import requests
+from functools import partial
+
+import httpx
+
+# orjson est optionnel (`uv add orjson`) : décodage / écriture JSON plus rapides
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Import configuration depuis config.py
 from config import ollama_config, llm_config
 
 # Fix encoding Windows
 if sys.platform == "win32":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
-# Importer les questions depuis bench_questions.py (module de données)
-import importlib.util
+# Questions depuis bench_questions.py (module de données, même répertoire)
+from bench_questions import QUESTIONS, get_questions_by_level
 
-spec = importlib.util.spec_from_file_location("bench_questions", "bench_questions.py")
-bench_questions = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(bench_questions)
-QUESTIONS = bench_questions.QUESTIONS
-get_questions_by_level = bench_questions.get_questions_by_level
+# Mots-clés attendus en minuscules par question, calculés une fois au chargement
+_EXPECTED_LC = {
+    q["id"]: [kw.lower() for kw in q["expected_keywords"]] for q in QUESTIONS
+}
 
 
 # ── Configuration ─────────────────────────────────────────────────────────────
@@ -74,19 +94,56 @@ def get_ollama_url() -> str:
     return OLLAMA_URL
 
 
-def load_retriever_v3():
-    """Charge le retriever V3."""
+def load_retriever_v3(use_cache: bool = True):
+    """Charge le retriever V3 (avec cache de retrieval par défaut)."""
     try:
-        from retriever_v3 import retrieve_context_string
+        from retriever_v3 import TOP_K_RERANK, retrieve_context_string
+
+        if not use_cache:
+            return retrieve_context_string
+
+        from retrieval_cache import cached_retrieve_context_string
 
-        return retrieve_context_string
+        return partial(
+            cached_retrieve_context_string, top_k=TOP_K_RERANK, semantic=False
+        )
     except ImportError as e:
         print(f"❌ Erreur import retriever V3: {e}")
         return None
 
 
-def generate_response(query: str, context: str, model: str) -> tuple[str, float, int]:
-    """Génère une réponse avec Ollama."""
+def prefetch_embeddings(questions: list[dict], use_cache: bool = True) -> int:
+    """
+    Encode en un seul lot les questions dont le retrieval n'est pas en cache.
+
+    Les embeddings alimentent le cache LRU du retriever : le retrieval de
+    chaque question ne refait plus d'aller-retour Ollama.
+
+    Returns:
+        Nombre de questions encodées
+    """
+    from retriever_v3 import TOP_K_RERANK, embed_queries
+
+    pending = [q["question"] for q in questions]
+    if use_cache:
+        from retrieval_cache import get_retrieval_cache
+
+        cache = get_retrieval_cache()
+        pending = [
+            question
+            for question in pending
+            if not cache.contains(question, TOP_K_RERANK)
+        ]
+
+    if pending:
+        embed_queries(pending)
+    return len(pending)
+
+
+async def generate_response(
+    client: httpx.AsyncClient, query: str, context: str, model: str
+) -> tuple[str, float, int]:
+    """Génère une réponse avec Ollama (asynchrone)."""
     prompt = PROMPT_TEMPLATE.format(context=context, question=query)
 
     messages = [
@@ -94,42 +151,69 @@ def generate_response(query: str, context: str, model: str) -> tuple[str, float,
         {"role": "user", "content": prompt},
     ]
 
-    start_time = time.time()
+    start_time = time.perf_counter()
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    parts: list[str] = []
+    tokens = 0
 
     try:
-        response = requests.post(
+        # Streaming : le délai d'attente s'applique entre deux lignes, une
+        # génération bloquée est abandonnée sans attendre la réponse complète
+        async with client.stream(
+            "POST",
             f"{get_ollama_url()}/api/chat",
             json={
                 "model": model,
                 "messages": messages,
-                "stream": False,
+                "stream": True,
                 "options": {
                     "temperature": 0.1,
                     "top_p": 0.9,
                     "repeat_penalty": 1.1,
                     "num_predict": 1024,
+                    "num_ctx": 4096,
                 },
             },
             timeout=300,
-        )
-        response.raise_for_status()
+        ) as response:
+            response.raise_for_status()
 
-        elapsed = time.time() - start_time
-        response_data = response.json()
-        answer = response_data["message"]["content"]
-        tokens = response_data.get("eval_count", 0)
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = loads(line)
+                parts.append(chunk.get("message", {}).get("content", ""))
+                if chunk.get("done"):
+                    tokens = chunk.get("eval_count", 0)
+                    break
 
-        return answer, elapsed, tokens
+        elapsed = time.perf_counter() - start_time
+        return "".join(parts), elapsed, tokens
 
     except Exception as e:
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
         return f"Erreur: {e}", elapsed, 0
 
 
-def evaluate_answer(answer: str, expected_keywords: list[str], min_length: int) -> dict:
-    """Évalue la qualité d'une réponse."""
+def evaluate_answer(
+    answer: str,
+    expected_keywords: list[str],
+    min_length: int,
+    expected_lc: list[str] | None = None,
+) -> dict:
+    """Évalue la qualité d'une réponse.
+
+    `expected_lc` : mots-clés déjà en minuscules (même ordre que
+    `expected_keywords`), pour éviter de les recalculer à chaque réponse.
+    """
+    if expected_lc is None:
+        expected_lc = [kw.lower() for kw in expected_keywords]
     answer_lower = answer.lower()
-    found_keywords = [kw for kw in expected_keywords if kw.lower() in answer_lower]
+    found_keywords = [
+        kw
+        for kw, kw_lc in zip(expected_keywords, expected_lc, strict=True)
+        if kw_lc in answer_lower
+    ]
     keyword_score = len(found_keywords) / len(expected_keywords)
     length_ok = len(answer) >= min_length
 
@@ -148,81 +232,156 @@ def evaluate_answer(answer: str, expected_keywords: list[str], min_length: int)
     }
 
 
+# Retrievals d'avance entre l'étape de retrieval et celle de génération
+PIPELINE_DEPTH = 4
+
+
+def _score_question(
+    test: dict,
+    answer: str,
+    retrieval_time: float,
+    gen_time: float,
+    verbose: bool,
+) -> dict:
+    """Évalue et affiche le résultat d'une question."""
+    question_id = test["id"]
+    expected = test["expected_keywords"]
+
+    # Évaluation
+    eval_result = evaluate_answer(
+        answer, expected, test["min_length"], _EXPECTED_LC.get(test["id"])
+    )
+
+    # Affichage (un seul print : les questions se terminent dans le désordre)
+    status = (
+        "✅"
+        if eval_result["quality_score"] > 0.7
+        else "⚠️"
+        if eval_result["quality_score"] > 0.4
+        else "❌"
+    )
+    lines = [f"\n{status} {question_id}"]
+    if verbose:
+        lines.append(f"   Question: {test['question']}")
+    lines.append(f"   Qualité: {eval_result['quality_score']:.2f}/1.0")
+    lines.append(f"   ⏱️  Retrieval: {retrieval_time:.2f}s | Génération: {gen_time:.1f}s")
+    lines.append(f"   🎯 Keywords: {len(eval_result['found_keywords'])}/{len(expected)}")
+    if verbose and eval_result["found_keywords"]:
+        lines.append(f"   📝 Trouvés: {', '.join(eval_result['found_keywords'])}")
+    print("\n".join(lines), flush=True)
+
+    return {
+        "question_id": question_id,
+        "answer": answer[:200] + "..." if len(answer) > 200 else answer,
+        "retrieval_time": round(retrieval_time, 2),
+        "generation_time": round(gen_time, 2),
+        **eval_result,
+    }
+
+
+async def _retrieval_stage(
+    retrieve_func,
+    questions: list[dict],
+    queue: asyncio.Queue,
+    consumers: int,
+) -> None:
+    """Producteur : retrieval des questions (thread), dans l'ordre."""
+    try:
+        for i, test in enumerate(questions):
+            retrieval_start = time.perf_counter()
+            try:
+                context, _sources, _low_confidence = await asyncio.to_thread(
+                    retrieve_func, test["question"]
+                )
+                error = None
+            except Exception as e:
+                context, error = None, e
+            retrieval_time = time.perf_counter() - retrieval_start
+            await queue.put((i, test, context, retrieval_time, error))
+    finally:
+        # Une sentinelle par consommateur, même si le producteur échoue
+        for _ in range(consumers):
+            await queue.put(None)
+
+
+async def _generation_stage(
+    client: httpx.AsyncClient,
+    queue: asyncio.Queue,
+    model: str,
+    results: list[dict | None],
+    verbose: bool,
+) -> None:
+    """Consommateur : génération Ollama puis évaluation."""
+    while (item := await queue.get()) is not None:
+        i, test, context, retrieval_time, error = item
+        if error is not None:
+            print(f"\n   ❌ {test['id']} - Erreur retrieval: {error}", flush=True)
+            results[i] = {
+                "question_id": test["id"],
+                "error": str(error),
+                "quality_score": 0,
+            }
+            continue
+
+        answer, gen_time, tokens = await generate_response(
+            client, test["question"], context, model
+        )
+        results[i] = _score_question(test, answer, retrieval_time, gen_time, verbose)
+
+
+async def _benchmark_questions(
+    retrieve_func,
+    model: str,
+    questions: list[dict],
+    verbose: bool,
+    concurrency: int,
+) -> list[dict]:
+    """
+    Pipeline à deux étages : le retrieval de la question suivante se fait
+    pendant la génération des précédentes (au plus `concurrency` à la fois).
+    """
+    concurrency = max(1, concurrency)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+    results: list[dict | None] = [None] * len(questions)
+    # Un seul client : connexions keep-alive réutilisées d'une question à
+    # l'autre, pool dimensionné sur le parallélisme
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(limits=limits) as client:
+        await asyncio.gather(
+            _retrieval_stage(retrieve_func, questions, queue, concurrency),
+            *(
+                _generation_stage(client, queue, model, results, verbose)
+                for _ in range(concurrency)
+            ),
+        )
+    # Résultats dans l'ordre des questions
+    return results
+
+
 def benchmark_targeted(
     retrieve_func,
     model: str,
     questions: list[dict],
     verbose: bool = False,
+    concurrency: int = 1,
 ) -> dict:
-    """Benchmark ciblé sur des questions spécifiques."""
+    """Benchmark ciblé sur des questions spécifiques.
+
+    Les questions sont traitées en parallèle : au plus `concurrency`
+    générations simultanées côté Ollama (à aligner sur OLLAMA_NUM_PARALLEL).
+    """
     print(f"\n{'=' * 70}")
     print("🎯 Benchmark V3 CIBLÉ")
     print(f"{'=' * 70}")
     print(f"   Modèle LLM: {model}")
     print(f"   Questions: {len(questions)}")
+    print(f"   Parallélisme: {concurrency}")
 
-    results = []
-    total_retrieval_time = 0
-    total_generation_time = 0
-
-    for i, test in enumerate(questions, 1):
-        question_id = test["id"]
-        question = test["question"]
-        expected = test["expected_keywords"]
-
-        progress_bar = "█" * i + "░" * (len(questions) - i)
-        print(f"\n[{progress_bar}] Question {i}/{len(questions)}: {question_id}")
-        if verbose:
-            print(f"   Question: {question}")
-
-        # Retrieval
-        retrieval_start = time.time()
-        try:
-            context = retrieve_func(question)
-        except Exception as e:
-            print(f"   ❌ Erreur retrieval: {e}")
-            results.append(
-                {
-                    "question_id": question_id,
-                    "error": str(e),
-                    "quality_score": 0,
-                }
-            )
-            continue
-
-        retrieval_time = time.time() - retrieval_start
-        total_retrieval_time += retrieval_time
-
-        # Génération
-        answer, gen_time, tokens = generate_response(question, context, model)
-        total_generation_time += gen_time
-
-        # Évaluation
-        eval_result = evaluate_answer(answer, expected, test["min_length"])
-
-        # Affichage
-        status = (
-            "✅"
-            if eval_result["quality_score"] > 0.7
-            else "⚠️"
-            if eval_result["quality_score"] > 0.4
-            else "❌"
-        )
-        print(f"   {status} Qualité: {eval_result['quality_score']:.2f}/1.0")
-        print(f"   ⏱️  Retrieval: {retrieval_time:.2f}s | Génération: {gen_time:.1f}s")
-        print(f"   🎯 Keywords: {len(eval_result['found_keywords'])}/{len(expected)}")
-        if verbose and eval_result["found_keywords"]:
-            print(f"   📝 Trouvés: {', '.join(eval_result['found_keywords'])}")
-
-        results.append(
-            {
-                "question_id": question_id,
-                "answer": answer[:200] + "..." if len(answer) > 200 else answer,
-                "retrieval_time": round(retrieval_time, 2),
-                "generation_time": round(gen_time, 2),
-                **eval_result,
-            }
-        )
+    results = asyncio.run(
+        _benchmark_questions(retrieve_func, model, questions, verbose, concurrency)
+    )
 
     # Stats
     valid_results = [r for r in results if "error" not in r]
@@ -255,73 +414,81 @@ def generate_report(
     """Génère un rapport."""
     stats = benchmark["stats"]
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(benchmark, f, indent=2, ensure_ascii=False)
+    if ORJSON_AVAILABLE:
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(benchmark, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(benchmark, f, indent=2, ensure_ascii=False)
 
-    print(f"\n📊 Rapport sauvegardé: {output_file}\n")
+    # Rapport construit en mémoire puis écrit en une fois (console Windows lente)
+    lines = [f"\n📊 Rapport sauvegardé: {output_file}\n"]
 
-    print("=" * 70)
-    print("📈 RÉSULTATS BENCHMARK V3 CIBLÉ")
-    print("=" * 70)
+    lines.append("=" * 70)
+    lines.append("📈 RÉSULTATS BENCHMARK V3 CIBLÉ")
+    lines.append("=" * 70)
 
-    print(f"\n🎯 Modèle LLM: {benchmark['model']}")
-    print(f"📝 Questions: {benchmark['questions_tested']}")
+    lines.append(f"\n🎯 Modèle LLM: {benchmark['model']}")
+    lines.append(f"📝 Questions: {benchmark['questions_tested']}")
 
-    print("\n" + "-" * 70)
-    print(f"{'Métrique':<30} | {'Valeur':<15}")
-    print("-" * 70)
-    print(f"{'Qualité moyenne':<30} | {stats['avg_quality']:<15.3f}/1.0")
-    print(
+    lines.append("\n" + "-" * 70)
+    lines.append(f"{'Métrique':<30} | {'Valeur':<15}")
+    lines.append("-" * 70)
+    lines.append(f"{'Qualité moyenne':<30} | {stats['avg_quality']:<15.3f}/1.0")
+    lines.append(
         f"{'Questions résolues':<30} | {stats['questions_resolues']}/{benchmark['questions_tested']:<14}"
     )
-    print(f"{'Taux de réussite':<30} | {stats['taux_reussite']:<15.1f}%")
-    print("-" * 70)
+    lines.append(f"{'Taux de réussite':<30} | {stats['taux_reussite']:<15.1f}%")
+    lines.append("-" * 70)
 
     # Interprétation
-    print("\n" + "=" * 70)
-    print("💡 INTERPRÉTATION")
-    print("=" * 70)
+    lines.append("\n" + "=" * 70)
+    lines.append("💡 INTERPRÉTATION")
+    lines.append("=" * 70)
 
     if stats["avg_quality"] >= 0.90:
-        print("✅ EXCELLENT - Qualité >= 0.90/1.0")
+        lines.append("✅ EXCELLENT - Qualité >= 0.90/1.0")
     elif stats["avg_quality"] >= 0.80:
-        print("✅ TRÈS BON - Qualité >= 0.80/1.0")
+        lines.append("✅ TRÈS BON - Qualité >= 0.80/1.0")
     elif stats["avg_quality"] >= 0.70:
-        print("⚠️  BON - Qualité >= 0.70/1.0")
+        lines.append("⚠️  BON - Qualité >= 0.70/1.0")
     else:
-        print("❌ MOYEN - Qualité < 0.70/1.0")
+        lines.append("❌ MOYEN - Qualité < 0.70/1.0")
 
     if stats["taux_reussite"] >= 80:
-        print(
+        lines.append(
             f"✅ {stats['taux_reussite']:.1f}% des questions résolues (objectif >= 80%)"
         )
     else:
-        print(
+        lines.append(
             f"⚠️  {stats['taux_reussite']:.1f}% des questions résolues (objectif >= 80%)"
         )
 
     # Questions ratées
     failed = [r for r in benchmark["results"] if r.get("quality_score", 0) <= 0.7]
     if failed:
-        print(
+        lines.append(
             f"\n⚠️  Questions à améliorer ({len(failed)}/{benchmark['questions_tested']}):"
         )
         for r in failed:
-            print(f"   - {r['question_id']}: {r.get('quality_score', 0):.2f}/1.0")
+            lines.append(f"   - {r['question_id']}: {r.get('quality_score', 0):.2f}/1.0")
 
     # Comparaison
-    print("\n" + "=" * 70)
-    print("📊 COMPARAISON AVEC AVANT")
-    print("=" * 70)
-    print("Avant (V2) : backend=0.00, weight=0.20")
-    print(
+    lines.append("\n" + "=" * 70)
+    lines.append("📊 COMPARAISON AVEC AVANT")
+    lines.append("=" * 70)
+    lines.append("Avant (V2) : backend=0.00, weight=0.20")
+    lines.append(
         f"Après (V3) : {stats['avg_quality']:.3f} ({stats['taux_reussite']:.1f}% résolues)"
     )
 
     if stats["avg_quality"] > 0.70:
-        print("\n✅ AMÉLIORATION CONFIRMÉE !")
+        lines.append("\n✅ AMÉLIORATION CONFIRMÉE !")
     else:
-        print("\n⚠️  Amélioration insuffisante")
+        lines.append("\n⚠️  Amélioration insuffisante")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def main():
@@ -356,13 +523,27 @@ def main():
         action="store_true",
         help="Afficher plus de détails",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Désactiver le cache de retrieval",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=ollama_config.num_parallel,
+        help=(
+            "Questions traitées en parallèle "
+            f"(défaut: OLLAMA_NUM_PARALLEL={ollama_config.num_parallel})"
+        ),
+    )
 
     args = parser.parse_args()
 
     # Vérifier Ollama
     print("🔍 Vérification d'Ollama...", flush=True)
     try:
-        response = requests.get(f"{get_ollama_url()}/api/tags", timeout=10)
+        response = httpx.get(f"{get_ollama_url()}/api/tags", timeout=10)
         response.raise_for_status()
         available_models = [m["name"] for m in response.json().get("models", [])]
         print(f"✅ {len(available_models)} modèles disponibles\n", flush=True)
@@ -377,7 +558,7 @@ def main():
 
     # Charger retriever
     print("📥 Chargement du retriever V3...", flush=True)
-    retrieve_v3 = load_retriever_v3()
+    retrieve_v3 = load_retriever_v3(use_cache=not args.no_cache)
 
     if not retrieve_v3:
         print("❌ Impossible de charger le retriever V3", flush=True)
@@ -413,12 +594,29 @@ def main():
         sys.exit(1)
 
     print(f"📋 Modèle LLM: {args.model}", flush=True)
-    print(f"⏱️  Temps estimé: ~{len(questions_to_test) * 25:.0f}s\n", flush=True)
+    estimated = len(questions_to_test) * 25 / max(1, args.concurrency)
+    print(f"⏱️  Temps estimé: ~{estimated:.0f}s\n", flush=True)
+
+    # Embeddings des questions en un lot, avant la boucle de benchmark
+    try:
+        start = time.perf_counter()
+        count = prefetch_embeddings(questions_to_test, use_cache=not args.no_cache)
+        if count:
+            print(
+                f"✅ {count} questions encodées en {time.perf_counter() - start:.1f}s\n",
+                flush=True,
+            )
+    except Exception as e:
+        print(f"⚠️  Pré-encodage des questions impossible: {e}\n", flush=True)
 
     # Benchmark
     try:
         result = benchmark_targeted(
-            retrieve_v3, args.model, questions_to_test, args.verbose
+            retrieve_v3,
+            args.model,
+            questions_to_test,
+            args.verbose,
+            concurrency=args.concurrency,
         )
     except Exception as e:
         print(f"\n❌ Erreur benchmark: {e}", flush=True)
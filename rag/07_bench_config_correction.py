@@ -13,9 +13,14 @@ Le benchmark évalue la capacité du LLM à :
 """
 
 import argparse
+import asyncio
+import hashlib
+import re
+import sqlite3
 import sys
 import time
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 # Imports des modules de benchmark
@@ -45,51 +50,60 @@ from bench_config_metrics import (
 from bench_config_report import BenchmarkReportGenerator
 
 # Imports des modules LLM et RAG
-from llm import generate_response_sync
-from retriever_v3 import retrieve_context_string
-from config import ollama_config
+from llm import agenerate_response
+from retriever_v3 import (
+    _load_indexes,
+    embed_queries,
+    retrieve_context_string,
+)
+from retrieval_cache import cached_retrieve_context_string, get_retrieval_cache
+from config import cache_config, ollama_config
 
 
 # =============================================================================
 # Prompts
 # =============================================================================
 
-OLLAMA_ONLY_PROMPT = """Tu es un expert en configuration HAProxy.
+# Les instructions (identiques pour tous les tests) sont envoyées comme
+# prompt système, en tête de requête ; seuls le contexte et la configuration
+# varient, en fin de requête. Ollama réutilise son cache KV pour ce préfixe
+# commun tant que le modèle reste chargé (keep_alive).
+
+OLLAMA_ONLY_SYSTEM_PROMPT = """Tu es un expert en configuration HAProxy.
 
-Analyse le fichier de configuration suivant et :
+Analyse le fichier de configuration fourni et :
 1. Identifie toutes les erreurs (syntaxiques, logiques, de sécurité)
 2. Propose les corrections nécessaires
 3. Explique chaque correction
 
-Configuration :
-{config}
-
 Réponds avec :
 - Liste des erreurs trouvées
 - Configuration corrigée
 - Explications des corrections
 """
 
-RAG_PROMPT = """Tu es un expert en configuration HAProxy.
+RAG_SYSTEM_PROMPT = """Tu es un expert en configuration HAProxy.
 
-En utilisant UNIQUEMENT le contexte fourni ci-dessous :
+En utilisant UNIQUEMENT le contexte fourni entre <context> et </context> :
 1. Identifie toutes les erreurs dans la configuration
 2. Propose les corrections nécessaires
 3. Explique chaque correction avec des références à la documentation
 
-<context>
-{context}
-</context>
-
-Configuration à analyser :
-{config}
-
 RÈGLES ABSOLUES :
 - Réponds UNIQUEMENT à partir du contexte fourni
 - Cite TOUJOURS la source entre parenthèses
 - JAMAIS d'invention ou de supposition
 """
 
+# Nombre de chunks de documentation récupérés par test
+RAG_TOP_K = 5
+
+OLLAMA_ONLY_PROMPT = """Configuration :
+{config}"""
+
+RAG_PROMPT = """Configuration à analyser :
+{config}"""
+
 
 # =============================================================================
 # Fonctions utilitaires
@@ -108,35 +122,169 @@ def build_ollama_only_prompt(config: str) -> str:
     return OLLAMA_ONLY_PROMPT.format(config=config.strip())
 
 
-def build_rag_prompt(config: str, context: str) -> str:
+def build_rag_query(test: dict[str, Any]) -> str:
+    """Construit la requête de retrieval d'un test.
+
+    Args:
+        test: Cas de test
+
+    Returns:
+        Requête pour le retriever
+    """
+    query = f"Correction de configuration HAProxy: {test['name']}"
+    if test.get("metadata", {}).get("keywords"):
+        query += " " + " ".join(test["metadata"]["keywords"])
+    return query
+
+
+def build_rag_prompt(config: str) -> str:
     """Construit le prompt pour Ollama + RAG.
 
+    Le contexte n'en fait pas partie : il est placé par `llm.build_messages`
+    dans le bloc <context> du message utilisateur.
+
     Args:
         config: Configuration HAProxy à analyser
-        context: Contexte récupéré par RAG
 
     Returns:
         Prompt complet pour le LLM
     """
-    return RAG_PROMPT.format(context=context, config=config.strip())
+    return RAG_PROMPT.format(config=config.strip())
+
+
+async def generate_text(
+    question: str, context: str, model: str, system_prompt: str
+) -> str:
+    """Génère une réponse complète via le client Ollama asynchrone partagé.
+
+    Args:
+        question: Prompt à envoyer
+        context: Contexte RAG (chaîne vide pour Ollama seul)
+        model: Modèle LLM à utiliser
+        system_prompt: Instructions du benchmark (préfixe commun)
+
+    Returns:
+        Réponse complète du LLM
+    """
+    return "".join(
+        [
+            token
+            async for token in agenerate_response(
+                question=question,
+                context=context,
+                model=model,
+                system_prompt=system_prompt,
+            )
+        ]
+    )
+
+
+class ResponseCache:
+    """Cache SQLite des réponses LLM, clé sha256(modèle, système, contexte, prompt).
+
+    Relancer le benchmark avec le même modèle ne renvoie pas les prompts
+    déjà traités à Ollama.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """Ouvre (ou crée) le cache.
+
+        Args:
+            db_path: Fichier SQLite
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path))
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+        self._db.commit()
+        # État sha256 après le préfixe (modèle, système), commun à tous les
+        # tests d'une passe : seuls contexte et prompt sont hachés par appel
+        self._prefix_hashes: dict[tuple[str, str], Any] = {}
+
+    def _key(self, model: str, system: str, context: str, prompt: str) -> str:
+        prefix = self._prefix_hashes.get((model, system))
+        if prefix is None:
+            prefix = hashlib.sha256(f"{model}\0{system}\0".encode())
+            self._prefix_hashes[(model, system)] = prefix
+        digest = prefix.copy()
+        digest.update(f"{context}\0{prompt}".encode())
+        return digest.hexdigest()
+
+    def get(self, model: str, system: str, context: str, prompt: str) -> str | None:
+        """Retourne la réponse en cache, ou None."""
+        row = self._db.execute(
+            "SELECT response FROM responses WHERE key = ?",
+            (self._key(model, system, context, prompt),),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(
+        self, model: str, system: str, context: str, prompt: str, response: str
+    ) -> None:
+        """Enregistre une réponse."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+            (self._key(model, system, context, prompt), response),
+        )
+        self._db.commit()
+
+
+PROGRESS_BAR_LENGTH = 30
+PROGRESS_MIN_INTERVAL = 0.05  # 20 rafraîchissements par seconde au plus
+_PROGRESS_FULL = "█" * PROGRESS_BAR_LENGTH
+_PROGRESS_EMPTY = "░" * PROGRESS_BAR_LENGTH
+# Dernier affichage : (préfixe, instant monotonic)
+_progress_last: tuple[str, float] = ("", 0.0)
 
 
 def print_progress(current: int, total: int, prefix: str = "Progress") -> None:
     """Affiche une barre de progression ASCII.
 
+    Les mises à jour rapprochées (< PROGRESS_MIN_INTERVAL) d'une même barre
+    sont ignorées ; le début (nouveau préfixe) et la fin sont toujours affichés.
+
     Args:
         current: Élément actuel
         total: Nombre total d'éléments
         prefix: Préfixe de la barre
     """
+    global _progress_last
+    now = time.monotonic()
+    last_prefix, last_time = _progress_last
+    if (
+        prefix == last_prefix
+        and current < total
+        and now - last_time < PROGRESS_MIN_INTERVAL
+    ):
+        return
+    _progress_last = (prefix, now)
+
     percent = int(100 * current / total) if total > 0 else 0
-    bar_length = 30
-    filled = int(bar_length * current / total) if total > 0 else 0
-    bar = "█" * filled + "░" * (bar_length - filled)
+    filled = int(PROGRESS_BAR_LENGTH * current / total) if total > 0 else 0
+    bar = _PROGRESS_FULL[:filled] + _PROGRESS_EMPTY[filled:]
     sys.stdout.write(f"\r{prefix}: [{bar}] {percent}% ({current}/{total})")
     sys.stdout.flush()
 
 
+# Blocs de configuration dans une réponse du LLM, par ordre de priorité
+# (compilés une fois : appliqués à chaque réponse)
+_CONFIG_BLOCK_PATTERNS = (
+    # Blocs avec haproxy/conf ou sans langage (le langage est optionnel)
+    re.compile(r"```(?:haproxy|conf)?\n(.*?)```", re.DOTALL),
+    # Texte après "Configuration corrigée"
+    re.compile(r"Configuration corrigée\s*:\s*\n(.*?)(?:\n\n|\n[A-Z])", re.DOTALL),
+)
+
+
+# Mots-clés de section ouvrant une configuration HAProxy
+_SECTION_KEYWORDS = frozenset({"global", "defaults", "frontend", "backend", "listen"})
+
+# Mentions d'erreur dans une ligne de réponse (déjà en minuscules)
+_ERROR_MENTION = re.compile(r"erreur|error|problème|faute")
+
+
 def extract_config_from_response(response: str) -> str:
     """Extrait la configuration de la réponse du LLM.
 
@@ -147,36 +295,38 @@ def extract_config_from_response(response: str) -> str:
         Configuration extraite ou chaîne vide
     """
     # Chercher les blocs de code markdown
-    import re
-
-    # Pattern pour les blocs de code avec ou sans spécification de langage
-    patterns = [
-        r"```(?:haproxy|conf)?\n(.*?)```",  # Blocs avec haproxy/conf
-        r"```\n(.*?)```",  # Blocs sans langage
-        r"Configuration corrigée\s*:\s*\n(.*?)(?:\n\n|\n[A-Z])",  # Texte après "Configuration corrigée"
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, response, re.DOTALL)
+    for pattern in _CONFIG_BLOCK_PATTERNS:
+        matches = pattern.findall(response)
         if matches:
             # Retourner le premier bloc de code trouvé
             return matches[0].strip()
 
     # Si aucun bloc de code, essayer d'extraire les lignes de configuration
-    lines = []
-    in_config = False
-    for line in response.split("\n"):
-        line = line.strip()
-        # Détecter le début d'une configuration HAProxy
-        if line in ("global", "defaults", "frontend", "backend", "listen"):
-            in_config = True
-        if in_config and line and not line.startswith("#"):
-            lines.append(line)
-        # Arrêter si on rencontre une section de texte
-        if in_config and line and line[0].isupper() and len(line.split()) > 3:
-            break
-
-    return "\n".join(lines) if lines else ""
+    stripped = [line.strip() for line in response.split("\n")]
+
+    # Détecter le début d'une configuration HAProxy
+    start = next(
+        (i for i, line in enumerate(stripped) if line in _SECTION_KEYWORDS), None
+    )
+    if start is None:
+        return ""
+
+    # Arrêter après la première section de texte (ligne incluse)
+    end = next(
+        (
+            i + 1
+            for i in range(start, len(stripped))
+            if stripped[i]
+            and stripped[i][0].isupper()
+            and len(stripped[i].split()) > 3
+        ),
+        len(stripped),
+    )
+
+    # Joindre directement la tranche, sans les lignes vides ni commentaires
+    return "\n".join(
+        line for line in stripped[start:end] if line and not line.startswith("#")
+    )
 
 
 def parse_llm_response(
@@ -197,33 +347,39 @@ def parse_llm_response(
     fixed_config = extract_config_from_response(response)
 
     # Analyser la réponse pour détecter les erreurs mentionnées
+    # Minuscules en une fois pour toute la réponse (lower() ne change pas le
+    # nombre de lignes : les deux listes restent alignées)
+    response_lower = response.lower()
+
+    # Aucune mention d'erreur dans toute la réponse : pas de découpage en lignes
+    if not _ERROR_MENTION.search(response_lower):
+        return detected_errors, fixed_config
+
     lines = response.split("\n")
-    for line_num, line in enumerate(lines, start=1):
-        line_lower = line.lower()
-
-        # Détecter les mentions d'erreurs
-        error_keywords = ["erreur", "error", "problème", "problème", "faute"]
-        for keyword in error_keywords:
-            if keyword in line_lower:
-                # Essayer d'extraire le type d'erreur
-                error_type = ErrorType.SYNTAX
-                if "syntax" in line_lower:
-                    error_type = ErrorType.SYNTAX
-                elif "logique" in line_lower or "logic" in line_lower:
-                    error_type = ErrorType.LOGIC
-                elif "sécurité" in line_lower or "security" in line_lower:
-                    error_type = ErrorType.SECURITY
-
-                detected_errors.append(
-                    ValidationError(
-                        line=0,  # Ligne inconnue dans la réponse
-                        column=0,
-                        error_type=error_type,
-                        severity=ErrorSeverity.ERROR,
-                        message=line.strip(),
-                    )
-                )
-                break
+    lines_lower = response_lower.split("\n")
+    for line, line_lower in zip(lines, lines_lower, strict=True):
+        # Détecter les mentions d'erreurs (une seule recherche par ligne)
+        if not _ERROR_MENTION.search(line_lower):
+            continue
+
+        # Essayer d'extraire le type d'erreur
+        error_type = ErrorType.SYNTAX
+        if "syntax" in line_lower:
+            error_type = ErrorType.SYNTAX
+        elif "logique" in line_lower or "logic" in line_lower:
+            error_type = ErrorType.LOGIC
+        elif "sécurité" in line_lower or "security" in line_lower:
+            error_type = ErrorType.SECURITY
+
+        detected_errors.append(
+            ValidationError(
+                line=0,  # Ligne inconnue dans la réponse
+                column=0,
+                error_type=error_type,
+                severity=ErrorSeverity.ERROR,
+                message=line.strip(),
+            )
+        )
 
     return detected_errors, fixed_config
 
@@ -240,18 +396,134 @@ class BenchmarkRunner:
         self,
         model: str = ollama_config.llm_model,
         verbose: bool = False,
+        concurrency: int = ollama_config.num_parallel,
+        use_cache: bool = False,
     ) -> None:
         """Initialise le runner de benchmark.
 
         Args:
             model: Modèle LLM à utiliser
             verbose: Mode verbeux
+            concurrency: Nombre de tests exécutés en parallèle
+            use_cache: Réutiliser les réponses LLM et retrievals en cache
+                (les temps mesurés ne reflètent alors plus le modèle)
         """
         self.model = model
         self.verbose = verbose
+        self.concurrency = max(1, concurrency)
         self.validator = HAProxyValidator()
+        self.use_cache = use_cache
+        self.response_cache: ResponseCache | None = None
+        if use_cache and cache_config.bench_response_cache_path:
+            try:
+                self.response_cache = ResponseCache(
+                    Path(cache_config.bench_response_cache_path).expanduser()
+                )
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ Cache des réponses désactivé : {e}")
+
+    async def _generate(self, prompt: str, context: str, system_prompt: str) -> str:
+        """Génère une réponse, en passant par le cache des réponses.
+
+        Args:
+            prompt: Prompt à envoyer
+            context: Contexte RAG (chaîne vide pour Ollama seul)
+            system_prompt: Instructions du benchmark
+
+        Returns:
+            Réponse du LLM
+        """
+        cache = self.response_cache
+        if cache is not None:
+            response = cache.get(self.model, system_prompt, context, prompt)
+            if response is not None:
+                return response
+
+        response = await generate_text(
+            question=prompt,
+            context=context,
+            model=self.model,
+            system_prompt=system_prompt,
+        )
+
+        # Les messages d'erreur d'agenerate_response ne sont pas mis en cache
+        if cache is not None and not response.startswith(("❌", "⏱️")):
+            cache.put(self.model, system_prompt, context, prompt, response)
+        return response
+
+    def _retrieve(self, query: str) -> str:
+        """Retrieval RAG (cache exact de retrieval_cache si activé).
+
+        Args:
+            query: Requête de retrieval
+
+        Returns:
+            Contexte formaté
+        """
+        if self.use_cache:
+            context, _, _ = cached_retrieve_context_string(
+                query, top_k=RAG_TOP_K, semantic=False
+            )
+        else:
+            context, _, _ = retrieve_context_string(query, top_k=RAG_TOP_K)
+        return context
+
+    async def run(
+        self, tests: list[dict[str, Any]]
+    ) -> tuple[list[BenchmarkResult], list[BenchmarkResult]]:
+        """Exécute les deux passes (Ollama seul puis Ollama + RAG).
+
+        Les deux passes partagent la même boucle d'événements, donc le même
+        client HTTP asynchrone et ses connexions keep-alive.
+
+        Args:
+            tests: Liste des tests à exécuter
+
+        Returns:
+            Tuple (résultats Ollama seul, résultats Ollama + RAG)
+        """
+        # Cache du validateur dimensionné sur le run : par test, config
+        # originale et config attendue (fixtures, communes aux deux passes)
+        # plus une config corrigée par passe. Les fixtures ne sont analysées
+        # qu'une fois, sans éviction entre les deux passes
+        self.validator.cache_size = max(self.validator.cache_size, 4 * len(tests))
+
+        ollama_results = await self.run_ollama_only(tests)
+        rag_results = await self.run_ollama_rag(tests)
+        return ollama_results, rag_results
+
+    async def _run_all(
+        self, tests: list[dict[str, Any]], run_single, prefix: str
+    ) -> list[BenchmarkResult]:
+        """Exécute `run_single` sur chaque test, au plus `concurrency` à la fois.
+
+        Args:
+            tests: Liste des tests à exécuter
+            run_single: Coroutine exécutant un test
+            prefix: Préfixe de la barre de progression
 
-    def run_ollama_only(self, tests: list[dict[str, Any]]) -> list[BenchmarkResult]:
+        Returns:
+            Liste des résultats, dans l'ordre des tests
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        done = 0
+
+        async def _run(test: dict[str, Any]) -> BenchmarkResult:
+            nonlocal done
+            async with semaphore:
+                result = await run_single(test)
+            done += 1
+            print_progress(done, len(tests), prefix)
+            return result
+
+        print_progress(0, len(tests), prefix)
+        results = await asyncio.gather(*(_run(test) for test in tests))
+        print("\n")
+        return list(results)
+
+    async def run_ollama_only(
+        self, tests: list[dict[str, Any]]
+    ) -> list[BenchmarkResult]:
         """Exécute les tests avec Ollama seul.
 
         Args:
@@ -260,23 +532,15 @@ class BenchmarkRunner:
         Returns:
             Liste des résultats de benchmark
         """
-        results: list[BenchmarkResult] = []
-
         print(f"\n{'=' * 60}")
         print(f"Exécution des tests avec Ollama seul ({self.model})")
         print(f"{'=' * 60}\n")
 
-        for i, test in enumerate(tests):
-            print_progress(i, len(tests), "Ollama seul")
-            result = self.run_single_test_ollama(test)
-            results.append(result)
-
-        print_progress(len(tests), len(tests), "Ollama seul")
-        print("\n")
-
-        return results
+        return await self._run_all(tests, self.run_single_test_ollama, "Ollama seul")
 
-    def run_ollama_rag(self, tests: list[dict[str, Any]]) -> list[BenchmarkResult]:
+    async def run_ollama_rag(
+        self, tests: list[dict[str, Any]]
+    ) -> list[BenchmarkResult]:
         """Exécute les tests avec Ollama + RAG.
 
         Args:
@@ -285,23 +549,45 @@ class BenchmarkRunner:
         Returns:
             Liste des résultats de benchmark
         """
-        results: list[BenchmarkResult] = []
-
         print(f"\n{'=' * 60}")
         print(f"Exécution des tests avec Ollama + RAG ({self.model})")
         print(f"{'=' * 60}\n")
 
-        for i, test in enumerate(tests):
-            print_progress(i, len(tests), "Ollama + RAG")
-            result = self.run_single_test_rag(test)
-            results.append(result)
+        # Index chargés et requêtes encodées une fois, hors des temps mesurés
+        # (sinon le premier test paie seul ce coût fixe)
+        await asyncio.to_thread(
+            self.prepare_retrieval, [build_rag_query(test) for test in tests]
+        )
+
+        return await self._run_all(tests, self.run_single_test_rag, "Ollama + RAG")
 
-        print_progress(len(tests), len(tests), "Ollama + RAG")
-        print("\n")
+    def prepare_retrieval(self, queries: list[str]) -> None:
+        """Charge les index du retriever et encode les requêtes en un lot.
 
-        return results
+        Les embeddings alimentent le cache LRU du retriever : le retrieval de
+        chaque test ne refait plus d'aller-retour Ollama.
 
-    def run_single_test_ollama(self, test: dict[str, Any]) -> BenchmarkResult:
+        Args:
+            queries: Requêtes de retrieval des tests
+        """
+        try:
+            _load_indexes()
+            if self.use_cache:
+                # Requêtes déjà en cache de retrieval : pas besoin d'embedding
+                cache = get_retrieval_cache()
+                queries = [
+                    query
+                    for query in queries
+                    if not cache.contains(query, RAG_TOP_K)
+                ]
+            if queries:
+                embed_queries(queries)
+        except Exception as e:
+            # Le retrieval de chaque test reportera l'erreur
+            if self.verbose:
+                print(f"\nErreur lors du chargement des index: {e}")
+
+    async def run_single_test_ollama(self, test: dict[str, Any]) -> BenchmarkResult:
         """Exécute un test avec Ollama seul.
 
         Args:
@@ -317,10 +603,9 @@ class BenchmarkRunner:
 
         # Générer la réponse
         try:
-            response = generate_response_sync(
-                question=prompt,
-                context="",  # Pas de contexte pour Ollama seul
-                model=self.model,
+            # Pas de contexte pour Ollama seul
+            response = await self._generate(
+                prompt, context="", system_prompt=OLLAMA_ONLY_SYSTEM_PROMPT
             )
         except Exception as e:
             if self.verbose:
@@ -373,7 +658,7 @@ class BenchmarkRunner:
             response_time=response_time,
             retrieval_time=None,
             generation_time=response_time,
-            input_tokens=0,  # Non disponible avec generate_response_sync
+            input_tokens=0,  # Non disponible via agenerate_response
             output_tokens=0,
             detected_errors=detected_errors,
             expected_errors=test.get("expected_errors", []),
@@ -381,10 +666,10 @@ class BenchmarkRunner:
             expected_fixed_config=test.get("expected_fixed_config", ""),
             model=self.model,
             rag_used=False,
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            timestamp=datetime.now().isoformat(sep=" ", timespec="seconds"),
         )
 
-    def run_single_test_rag(self, test: dict[str, Any]) -> BenchmarkResult:
+    async def run_single_test_rag(self, test: dict[str, Any]) -> BenchmarkResult:
         """Exécute un test avec Ollama + RAG.
 
         Args:
@@ -396,14 +681,12 @@ class BenchmarkRunner:
         start_time = time.time()
 
         # Construire la requête pour RAG
-        query = f"Correction de configuration HAProxy: {test['name']}"
-        if test.get("metadata", {}).get("keywords"):
-            query += " " + " ".join(test["metadata"]["keywords"])
+        query = build_rag_query(test)
 
         # Récupérer le contexte
         retrieval_start = time.time()
         try:
-            context, _, _ = retrieve_context_string(query, top_k=5)
+            context = await asyncio.to_thread(self._retrieve, query)
         except Exception as e:
             if self.verbose:
                 print(f"\nErreur lors du retrieval: {e}")
@@ -412,16 +695,12 @@ class BenchmarkRunner:
         retrieval_time = retrieval_end - retrieval_start
 
         # Construire le prompt
-        prompt = build_rag_prompt(test["original_config"], context)
+        prompt = build_rag_prompt(test["original_config"])
 
         # Générer la réponse
         generation_start = time.time()
         try:
-            response = generate_response_sync(
-                question=prompt,
-                context=context,
-                model=self.model,
-            )
+            response = await self._generate(prompt, context, RAG_SYSTEM_PROMPT)
         except Exception as e:
             if self.verbose:
                 print(f"\nErreur lors de la génération: {e}")
@@ -475,7 +754,7 @@ class BenchmarkRunner:
             response_time=response_time,
             retrieval_time=retrieval_time,
             generation_time=generation_time,
-            input_tokens=0,  # Non disponible avec generate_response_sync
+            input_tokens=0,  # Non disponible via agenerate_response
             output_tokens=0,
             detected_errors=detected_errors,
             expected_errors=test.get("expected_errors", []),
@@ -483,7 +762,7 @@ class BenchmarkRunner:
             expected_fixed_config=test.get("expected_fixed_config", ""),
             model=self.model,
             rag_used=True,
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            timestamp=datetime.now().isoformat(sep=" ", timespec="seconds"),
         )
 
 
@@ -512,6 +791,9 @@ Exemples d'utilisation :
   # Exécuter avec un modèle spécifique
   python 07_bench_config_correction.py --model qwen3:latest
 
+  # Exécuter 8 tests en parallèle
+  python 07_bench_config_correction.py --concurrency 8
+
   # Générer tous les formats de rapport
   python 07_bench_config_correction.py --format all
         """,
@@ -548,6 +830,23 @@ Exemples d'utilisation :
         action="store_true",
         help="Mode verbeux",
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=(
+            "Réutiliser les réponses LLM et retrievals en cache "
+            "(itération sur la validation ; temps non significatifs)"
+        ),
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=ollama_config.num_parallel,
+        help=(
+            "Tests exécutés en parallèle "
+            f"(défaut: OLLAMA_NUM_PARALLEL={ollama_config.num_parallel})"
+        ),
+    )
 
     return parser.parse_args()
 
@@ -590,6 +889,9 @@ def main() -> int:
     print(f"Niveau de tests : {args.tests}")
     print(f"Format de rapport : {args.format}")
     print(f"Mode verbeux : {args.verbose}")
+    print(f"Parallélisme : {args.concurrency}")
+    if args.cache:
+        print("Cache : activé (temps de réponse non significatifs)")
     print("=" * 60)
 
     # Charger les tests
@@ -597,13 +899,15 @@ def main() -> int:
     print(f"\nNombre de tests à exécuter : {len(tests)}")
 
     # Initialiser le runner
-    runner = BenchmarkRunner(model=args.model, verbose=args.verbose)
-
-    # Exécuter les tests avec Ollama seul
-    ollama_results = runner.run_ollama_only(tests)
+    runner = BenchmarkRunner(
+        model=args.model,
+        verbose=args.verbose,
+        concurrency=args.concurrency,
+        use_cache=args.cache,
+    )
 
-    # Exécuter les tests avec Ollama + RAG
-    rag_results = runner.run_ollama_rag(tests)
+    # Exécuter les tests avec Ollama seul puis avec Ollama + RAG
+    ollama_results, rag_results = asyncio.run(runner.run(tests))
 
     # Générer les résumés
     ollama_summary = generate_summary_from_results(ollama_results)
@@ -2,12 +2,14 @@
 
 import gradio as gr
 
+from app.ui.components import DEFAULT_TOP_K, EXAMPLE_QUESTIONS
 from app.ui.layout import build_ui
 from app.services.chat_service import ChatService
 from app.services.rag_service import RAGService
 from app.services.llm_service import LLMService
 from app.state.manager import StateManager
 from app.utils.logging import setup_logging
+from config import chatbot_config
 
 logger = setup_logging(__name__)
 
@@ -26,10 +28,26 @@ def create_app() -> gr.Blocks:
         rag_service=rag_service,
         llm_service=llm_service,
         state_manager=state_manager,
+        trusted_messages=EXAMPLE_QUESTIONS,
     )
 
+    # Chargement des index (disque) puis préchauffage du cache avec les
+    # exemples (premiers clics les plus probables) dans un thread, pendant
+    # que la liste des modèles est demandée à Ollama (HTTP) puis que l'UI
+    # est construite
+    rag_service.preload(warm_queries=EXAMPLE_QUESTIONS, top_k=DEFAULT_TOP_K)
+    available_models = llm_service.list_models()
+
     # Construire l'UI
-    demo = build_ui(chat_service)
+    demo = build_ui(chat_service, available_models=available_models)
+
+    # La génération est asynchrone (httpx) : plusieurs sessions peuvent
+    # streamer en parallèle sans monopoliser un thread chacune. La génération
+    # a sa propre limite (concurrency_id "gen", cf. layout._wire_events)
+    demo.queue(
+        default_concurrency_limit=chatbot_config.queue_concurrency,
+        max_size=chatbot_config.queue_max_size,
+    )
 
     logger.info("Application Gradio créée avec succès")
     return demo
@@ -1,5 +1,8 @@
 """Chat service for HAProxy Chatbot."""
 
+import logging
+import time
+from collections.abc import Iterable
 from typing import AsyncGenerator
 
 from app.services.rag_service import RAGService
@@ -12,6 +15,9 @@ from app.utils.logging import setup_logging
 
 logger = setup_logging(__name__)
 
+# Ligne Markdown d'une source (méthode format liée une seule fois)
+_SOURCE_LINE = "{icon} [{n}] [{title}]({url})".format
+
 
 class ChatService:
     """Service principal gérant la logique du chat.
@@ -23,11 +29,26 @@ class ChatService:
     - Streaming des réponses
     """
 
+    # Coalescence du streaming : chaque rafraîchissement fait re-rendre tout
+    # le Markdown du message côté Gradio. L'intervalle entre deux
+    # rafraîchissements part de STREAM_FLUSH_INTERVAL et s'allonge avec la
+    # réponse (+100 % tous les STREAM_FLUSH_GROWTH_CHARS caractères), plafonné
+    # à STREAM_FLUSH_MAX_INTERVAL. Après STREAM_FLUSH_BOUNDARY_TOKENS tokens,
+    # un token finissant sur une limite naturelle (espace, ponctuation, fin de
+    # ligne) déclenche le rafraîchissement dès STREAM_FLUSH_INTERVAL : l'UI
+    # affiche des mots entiers plutôt que des fragments
+    STREAM_FLUSH_INTERVAL = 0.05
+    STREAM_FLUSH_MAX_INTERVAL = 0.25
+    STREAM_FLUSH_GROWTH_CHARS = 1000
+    STREAM_FLUSH_BOUNDARY_TOKENS = 16
+    STREAM_FLUSH_BOUNDARY_CHARS = frozenset(" \n.,;:!?")
+
     def __init__(
         self,
         rag_service: RAGService,
         llm_service: LLMService,
         state_manager: StateManager,
+        trusted_messages: Iterable[str] = (),
     ):
         """Initialise le service de chat.
 
@@ -35,11 +56,13 @@ class ChatService:
             rag_service: Service RAG
             llm_service: Service LLM
             state_manager: Gestionnaire d'état
+            trusted_messages: Messages prédéfinis (questions d'exemple)
+                exemptés de re-validation
         """
         self.rag = rag_service
         self.llm = llm_service
         self.state = state_manager
-        self.validator = InputValidator()
+        self.validator = InputValidator(trusted=trusted_messages)
 
     async def process_message(
         self,
@@ -83,9 +106,11 @@ class ChatService:
         user_message = ChatMessage(role="user", content=validated_message)
         await self.state.add_message(session_id, user_message)
 
-        # 4. RAG retrieval
+        # 4. RAG retrieval, pendant que le modèle se charge dans Ollama
+        self.llm.warm(config.model)
         try:
-            logger.info("RAG retrieval for: '%s...'", validated_message[:50])
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("RAG retrieval for: '%s...'", validated_message[:50])
             context_str, sources, low_confidence = await self.rag.retrieve(
                 query=validated_message, top_k=config.top_k
             )
@@ -102,8 +127,21 @@ class ChatService:
         # 5. Récupérer l'historique pour le LLM
         llm_history = session.get_history_for_llm(max_turns=3)
 
+        # Sources formatées une seule fois, hors de la boucle de streaming
+        sources_md = (
+            self._format_sources(sources) if config.show_sources and sources else ""
+        )
+
         # 6. Génération LLM avec streaming
-        response = ""
+        # Les tokens sont accumulés dans une liste (pas de concaténation de
+        # str à chaque token) et regroupés avant chaque rafraîchissement :
+        # une trame websocket par groupe plutôt qu'une par token
+        parts: list[str] = []
+        total_chars = 0
+        pending_tokens = 0
+        # Premier token affiché immédiatement
+        last_flush = 0.0
+        last_frame = ""
         try:
             async for token in self.llm.generate(
                 question=validated_message,
@@ -112,18 +150,32 @@ class ChatService:
                 history=llm_history,
                 temperature=config.temperature,
             ):
-                response += token
-                yield response
+                parts.append(token)
+                total_chars += len(token)
+                pending_tokens += 1
+                now = time.monotonic()
+                elapsed = now - last_flush
+                if elapsed >= self._flush_interval(total_chars) or (
+                    pending_tokens >= self.STREAM_FLUSH_BOUNDARY_TOKENS
+                    and elapsed >= self.STREAM_FLUSH_INTERVAL
+                    and token[-1:] in self.STREAM_FLUSH_BOUNDARY_CHARS
+                ):
+                    pending_tokens = 0
+                    last_flush = now
+                    last_frame = self._close_open_fence("".join(parts))
+                    yield last_frame
 
         except Exception as e:
             logger.error("LLM generation error: %s", e)
             yield f"❌ **Erreur de génération**\n\n{str(e)}"
             return
 
-        # 7. Ajouter les sources si configuré
-        if config.show_sources and sources:
-            sources_md = self._format_sources(sources)
-            response += sources_md
+        # 7. Dernier rafraîchissement, avec les sources si configuré : la
+        # réponse brute, dès qu'elle diffère de la dernière trame affichée
+        # (tokens en attente, sources, ou bloc de code fermé par l'affichage)
+        parts.append(sources_md)
+        response = "".join(parts)
+        if response != last_frame:
             yield response
 
         # 8. Sauvegarder la réponse dans l'historique
@@ -132,6 +184,39 @@ class ChatService:
         )
         await self.state.add_message(session_id, assistant_message)
 
+    @staticmethod
+    def _close_open_fence(text: str) -> str:
+        """Ferme un bloc de code Markdown resté ouvert dans une réponse partielle.
+
+        Sans cela, tant que le LLM écrit un bloc ```haproxy, tout le texte
+        qui suit est rendu comme du code puis re-rendu en Markdown à la
+        fermeture du bloc : l'affichage saute à chaque rafraîchissement.
+
+        Args:
+            text: Réponse partielle
+
+        Returns:
+            Réponse avec une clôture ``` ajoutée si nécessaire
+        """
+        if text.count("```") % 2:
+            return text + "\n```"
+        return text
+
+    def _flush_interval(self, total_chars: int) -> float:
+        """Intervalle minimal entre deux rafraîchissements du streaming.
+
+        Args:
+            total_chars: Longueur de la réponse accumulée
+
+        Returns:
+            Intervalle en secondes
+        """
+        return min(
+            self.STREAM_FLUSH_MAX_INTERVAL,
+            self.STREAM_FLUSH_INTERVAL
+            * (1 + total_chars / self.STREAM_FLUSH_GROWTH_CHARS),
+        )
+
     def _format_sources(self, sources: list[dict]) -> str:
         """Formate les sources en Markdown.
 
@@ -144,14 +229,16 @@ class ChatService:
         if not sources:
             return ""
 
-        lines = ["\n\n---\n\n**📚 Sources :**\n"]
-        for i, src in enumerate(sources):
-            icon = "📝" if src.get("has_code") else "📄"
-            title = src.get("title", "Unknown")
-            url = src.get("url", "#")
-            lines.append(f"{icon} [{i + 1}] [{title}]({url})")
-
-        return "\n".join(lines)
+        body = "\n".join(
+            _SOURCE_LINE(
+                icon="📝" if src.get("has_code") else "📄",
+                n=i,
+                title=src.get("title", "Unknown"),
+                url=src.get("url", "#"),
+            )
+            for i, src in enumerate(sources, start=1)
+        )
+        return f"\n\n---\n\n**📚 Sources :**\n\n{body}"
 
     async def clear_session(self, session_id: str) -> None:
         """Efface l'historique d'une session.
@@ -0,0 +1,94 @@
+"""Embedding micro-batcher for HAProxy Chatbot."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.logging import setup_logging
+
+logger = setup_logging(__name__)
+
+
+class EmbeddingBatcher:
+    """Regroupe les embeddings de requêtes des sessions simultanées.
+
+    Les requêtes arrivant dans une fenêtre de `max_latency` secondes (au plus
+    `max_batch_size`) partent en un seul lot vers `embed_queries` : un seul
+    créneau du rate limiter, requêtes Ollama parallèles, doublons fusionnés.
+    Les embeddings atterrissent dans le cache LRU du retriever, que le
+    retrieval consulte ensuite.
+
+    Les lots tournent sur un thread dédié, pas sur l'executor par défaut :
+    les retrievals qui attendent leur embedding y occupent des threads, un
+    lot ne doit jamais dépendre d'un thread libre dans ce pool.
+    """
+
+    def __init__(self, max_batch_size: int = 8, max_latency: float = 0.02):
+        """Initialise le batcher.
+
+        Args:
+            max_batch_size: Nombre maximum de requêtes par lot
+            max_latency: Attente maximale (secondes) avant l'envoi d'un lot
+        """
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        # Un seul thread suffit : le worker envoie les lots un par un
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="embedding-batcher"
+        )
+
+    async def embed(self, query: str) -> list[float] | None:
+        """Embedding d'une requête, via le prochain lot.
+
+        Args:
+            query: Requête utilisateur
+
+        Returns:
+            Embedding ou None (requête invalide ou Ollama indisponible)
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run(), name="embedding-batcher")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Boucle du worker : constitue et envoie les lots."""
+        from retriever_v3 import embed_queries
+
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            queries = [query for query, _ in batch]
+            try:
+                embeddings = await loop.run_in_executor(
+                    self._executor, embed_queries, queries
+                )
+                # strict : un lot incomplet échoue en entier plutôt que de
+                # laisser des requêtes sans réponse
+                results = list(zip(batch, embeddings, strict=True))
+            except Exception as e:
+                logger.error("Embedding batch failed: %s", e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            if len(batch) > 1:
+                logger.debug("Embedding batch of %d queries", len(batch))
+            for (_, future), embedding in results:
+                if not future.done():
+                    future.set_result(embedding)
@@ -1,12 +1,26 @@
 """LLM service for HAProxy Chatbot."""
 
 import asyncio
+import time
 from typing import AsyncGenerator
 
 from app.utils.logging import setup_logging
 
 logger = setup_logging(__name__)
 
+# Générateur asynchrone du module llm, importé au premier appel
+_agenerate_response = None
+
+
+def _get_agenerate_response():
+    """Retourne `llm.agenerate_response` (import différé, une seule fois)."""
+    global _agenerate_response
+    if _agenerate_response is None:
+        from llm import agenerate_response
+
+        _agenerate_response = agenerate_response
+    return _agenerate_response
+
 
 class LLMService:
     """Service LLM encapsulant la génération via Ollama.
@@ -17,6 +31,13 @@ class LLMService:
     - Gestion des erreurs
     """
 
+    # Un même modèle n'est pas rechargé plus d'une fois par WARM_INTERVAL
+    # secondes (il reste résident grâce au keep_alive d'Ollama)
+    WARM_INTERVAL = 60.0
+
+    _last_warm: dict[str, float] = {}
+    _warm_tasks: set[asyncio.Task] = set()
+
     FALLBACK_RESPONSE = """⚠️ Je n'ai pas trouvé d'information suffisamment précise dans la documentation HAProxy pour répondre à cette question.
 
 Suggestions :
@@ -47,24 +68,42 @@ Suggestions :
         # Lazy loading du module llm pour éviter de charger les dépendances
         # Ollama au démarrage de l'application. Cela permet un démarrage
         # plus rapide et une meilleure gestion de la mémoire. Le module n'est
-        # chargé que lors de la première requête de génération.
-        from llm import generate_response
-
-        # Exécuter la génération dans un thread séparé
-        loop = asyncio.get_event_loop()
-
-        for token in await loop.run_in_executor(
-            None,
-            lambda: generate_response(
-                question=question,
-                context=context,
-                model=model,
-                history=history,
-                temperature=temperature,
-            ),
+        # chargé que lors de la première requête de génération, puis gardé
+        # en global.
+        agenerate_response = _get_agenerate_response()
+
+        # Streaming httpx asynchrone : aucun thread n'est bloqué pendant la
+        # génération, la boucle d'événements sert les autres sessions
+        async for token in agenerate_response(
+            question=question,
+            context=context,
+            model=model,
+            history=history,
+            temperature=temperature,
         ):
             yield token
 
+    def warm(self, model: str) -> None:
+        """Lance le chargement du modèle dans Ollama en tâche de fond.
+
+        Appelé avant le retrieval : le chargement à froid du modèle se
+        recouvre avec la recherche au lieu de retarder le premier token.
+
+        Args:
+            model: Modèle LLM
+        """
+        now = time.monotonic()
+        if now - self._last_warm.get(model, float("-inf")) < self.WARM_INTERVAL:
+            return
+        self._last_warm[model] = now
+
+        from llm import aload_model
+
+        task = asyncio.create_task(aload_model(model))
+        # Référence forte jusqu'à la fin de la tâche
+        self._warm_tasks.add(task)
+        task.add_done_callback(self._warm_tasks.discard)
+
     def get_fallback_response(self) -> str:
         """Retourne la réponse par défaut.
 
@@ -1,11 +1,28 @@
 """RAG service for HAProxy Chatbot."""
 
 import asyncio
+import threading
 
+from config import chatbot_config, ollama_config
+
+from app.services.embedding_batcher import EmbeddingBatcher
 from app.utils.logging import setup_logging
 
 logger = setup_logging(__name__)
 
+# Fonction de retrieval, importée au premier appel puis gardée ici
+_cached_retrieve = None
+
+
+def _get_cached_retrieve():
+    """Retourne `cached_retrieve_context_string` (import différé, une seule fois)."""
+    global _cached_retrieve
+    if _cached_retrieve is None:
+        from retrieval_cache import cached_retrieve_context_string
+
+        _cached_retrieve = cached_retrieve_context_string
+    return _cached_retrieve
+
 
 class RAGService:
     """Service RAG encapsulant le retriever V3.
@@ -16,10 +33,16 @@ class RAGService:
     - Gestion des erreurs
     """
 
-    def __init__(self):
-        """Initialise le service RAG."""
-        self._indexes_loaded = False
-        self._load_lock = asyncio.Lock()
+    # Sentinelle et verrou partagés par toutes les instances du processus :
+    # les index ne sont chargés qu'une fois, quel que soit le point d'entrée
+    _indexes_loaded: bool = False
+    _load_lock = asyncio.Lock()
+
+    # Embeddings des requêtes simultanées regroupés en lots
+    _batcher = EmbeddingBatcher(
+        max_batch_size=chatbot_config.embed_batch_size,
+        max_latency=chatbot_config.embed_batch_latency_ms / 1000,
+    )
 
     async def retrieve(
         self, query: str, top_k: int = 5
@@ -39,19 +62,78 @@ class RAGService:
         # Lazy loading du module retriever_v3 pour éviter de charger les index
         # au démarrage de l'application. Cela permet un démarrage plus rapide
         # et une meilleure gestion de la mémoire. Le module n'est chargé que
-        # lors de la première requête de retrieval.
-        from retriever_v3 import retrieve_context_string
+        # lors de la première requête de retrieval, puis gardé en global.
+        cached_retrieve_context_string = _get_cached_retrieve()
+
+        # Exécuter le retrieval (cache mémoire -> disque -> pipeline complet)
+        # dans un thread séparé. Après un miss exact, l'embedding de la
+        # requête passe par le batcher, sur la boucle d'événements
+        loop = asyncio.get_running_loop()
+
+        def embed(text: str) -> list[float] | None:
+            future = asyncio.run_coroutine_threadsafe(self._batcher.embed(text), loop)
+            try:
+                return future.result(timeout=ollama_config.timeout)
+            except TimeoutError:
+                # Pas de cache sémantique pour cette requête : le retrieval
+                # calcule lui-même l'embedding
+                future.cancel()
+                logger.warning("Embedding batch timed out for: '%s...'", text[:50])
+                return None
 
-        # Exécuter le retrieval dans un thread séparé
-        loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(
-            None, lambda: retrieve_context_string(query, top_k=top_k)
+            None,
+            lambda: cached_retrieve_context_string(query, top_k=top_k, embed=embed),
         )
 
         return result
 
+    def preload(self, warm_queries: list[str] | None = None, top_k: int = 5) -> None:
+        """Lance le chargement des index dans un thread daemon.
+
+        Le chargement (ChromaDB, BM25, reranker) se recouvre avec la
+        construction de l'UI ; la première requête ne fait plus qu'attendre
+        la fin du chargement s'il n'est pas terminé (même verrou). Les
+        requêtes de `warm_queries` sont ensuite encodées en un seul lot,
+        puis exécutées pour remplir le cache de retrieval (mémoire + disque).
+
+        Args:
+            warm_queries: Requêtes à précalculer après le chargement
+            top_k: Profondeur utilisée pour le précalcul
+        """
+
+        def _preload() -> None:
+            from retrieval_cache import cached_retrieve_context_string
+            from retriever_v3 import _load_indexes, embed_queries
+
+            try:
+                _load_indexes()
+            except Exception as e:
+                logger.warning("Index preload failed: %s", e)
+                return
+
+            if warm_queries:
+                # Embeddings en parallèle (un seul créneau du rate limiter) :
+                # les retrievals ci-dessous les trouvent dans le cache LRU
+                embed_queries(list(warm_queries))
+
+            for query in warm_queries or []:
+                try:
+                    cached_retrieve_context_string(query, top_k=top_k)
+                except Exception as e:
+                    logger.warning("Cache warmup failed for %r: %s", query, e)
+                    return
+            if warm_queries:
+                logger.info("Retrieval cache warmed with %d queries", len(warm_queries))
+
+        threading.Thread(target=_preload, name="index-preload", daemon=True).start()
+
     async def _ensure_indexes(self) -> None:
         """Charge les index une seule fois de manière thread-safe."""
+        # Chemin rapide : une fois chargés, plus d'acquisition du verrou
+        if self._indexes_loaded:
+            return
+
         async with self._load_lock:
             if self._indexes_loaded:
                 return
@@ -61,9 +143,34 @@ class RAGService:
                 # les index au démarrage de l'application.
                 from retriever_v3 import _load_indexes
 
-                _load_indexes()
-                self._indexes_loaded = True
+                # Hors de la boucle d'événements : si le préchargement est en
+                # cours, on attend son verrou dans un thread du pool
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, _load_indexes)
+                RAGService._indexes_loaded = True
                 logger.info("✅ Indexes loaded successfully")
             except Exception as e:
                 logger.error("❌ Failed to load indexes: %s", e)
                 raise
+
+    async def index_status(self) -> tuple[bool, str]:
+        """Attend le chargement des index et retourne leur état.
+
+        Returns:
+            Tuple (chargés, message d'état)
+        """
+        try:
+            await self._ensure_indexes()
+        except Exception as e:
+            return False, f"❌ Index indisponibles : {e}"
+        return True, "✅ Index V3 chargés"
+
+    def get_cache_stats(self) -> dict | None:
+        """Retourne les statistiques du cache de retrieval.
+
+        Returns:
+            Compteurs du cache, ou None s'il n'a pas encore été initialisé
+        """
+        from retrieval_cache import retrieval_cache_stats
+
+        return retrieval_cache_stats()
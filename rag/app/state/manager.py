@@ -87,7 +87,7 @@ class StateManager:
         """
         async with self._lock:
             if session_id in self._sessions:
-                self._sessions[session_id].history.clear()
+                self._sessions[session_id].clear()
                 self._sessions[session_id].last_activity = datetime.now()
                 logger.info("Cleared history for session: %s", session_id)
             else:
@@ -1,11 +1,18 @@
 """Data models for HAProxy Chatbot state management."""
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Literal
 
 from config import llm_config
 
+# Nombre de tours (question, réponse) transmis au LLM
+MAX_LLM_TURNS = 3
+
+# Nombre de messages conservés par session (les plus anciens sont oubliés)
+MAX_HISTORY_MESSAGES = 50
+
 
 @dataclass
 class ChatMessage:
@@ -51,15 +58,24 @@ class ChatSession:
         session_id: Identifiant unique de la session
         created_at: Date de création de la session
         last_activity: Date de dernière activité
-        history: Historique des messages
+        history: Historique des messages (borné à MAX_HISTORY_MESSAGES,
+            éviction des plus anciens en O(1))
         config: Configuration de la session
+        llm_turns: Derniers tours (question, réponse) complets, tenus à jour
+            par `add_message` pour éviter de reparcourir l'historique
     """
 
     session_id: str
     created_at: datetime = field(default_factory=datetime.now)
     last_activity: datetime = field(default_factory=datetime.now)
-    history: list[ChatMessage] = field(default_factory=list)
+    history: deque[ChatMessage] = field(
+        default_factory=lambda: deque(maxlen=MAX_HISTORY_MESSAGES)
+    )
     config: ChatConfig = field(default_factory=ChatConfig)
+    llm_turns: deque[tuple[str, str]] = field(
+        default_factory=lambda: deque(maxlen=MAX_LLM_TURNS)
+    )
+    _pending_user: str | None = field(default=None, repr=False)
 
     def add_message(self, message: ChatMessage) -> None:
         """Ajoute un message à l'historique.
@@ -69,34 +85,33 @@ class ChatSession:
         """
         self.history.append(message)
         self.last_activity = datetime.now()
-        self._cleanup_old_messages()
 
-    def get_history_for_llm(self, max_turns: int = 3) -> list[tuple[str, str]]:
+        if message.role == "user":
+            self._pending_user = message.content
+        elif self._pending_user is not None:
+            self.llm_turns.append((self._pending_user, message.content))
+            self._pending_user = None
+
+    def get_history_for_llm(
+        self, max_turns: int = MAX_LLM_TURNS
+    ) -> list[tuple[str, str]]:
         """Retourne l'historique formaté pour le LLM.
 
         Args:
             max_turns: Nombre maximum de tours de conversation
+                (plafonné à MAX_LLM_TURNS)
 
         Returns:
             Liste de tuples (user_message, assistant_message)
         """
-        llm_history = []
-        user_msg = None
-
-        for msg in self.history[-max_turns * 2 :]:
-            if msg.role == "user":
-                user_msg = msg.content
-            elif msg.role == "assistant" and user_msg:
-                llm_history.append((user_msg, msg.content))
-                user_msg = None
-
-        return llm_history
-
-    def _cleanup_old_messages(self, max_messages: int = 50) -> None:
-        """Nettoie les anciens messages pour limiter la mémoire.
-
-        Args:
-            max_messages: Nombre maximum de messages à conserver
-        """
-        if len(self.history) > max_messages:
-            self.history = self.history[-max_messages:]
+        if max_turns >= len(self.llm_turns):
+            return list(self.llm_turns)
+        if max_turns <= 0:
+            return []
+        return list(self.llm_turns)[-max_turns:]
+
+    def clear(self) -> None:
+        """Efface l'historique et les tours transmis au LLM."""
+        self.history.clear()
+        self.llm_turns.clear()
+        self._pending_user = None
@@ -3,10 +3,55 @@
 import gradio as gr
 
 from app.utils.logging import setup_logging
-from config import llm_config, get_available_models
+from config import llm_config
 
 logger = setup_logging(__name__)
 
+# Questions d'exemple (boutons de la sidebar, préchauffage du cache)
+EXAMPLE_QUESTIONS = [
+    "Comment configurer un health check HTTP ?",
+    "Syntaxe de la directive bind avec SSL ?",
+    "Limiter les connexions par IP avec stick-table ?",
+    "Utiliser les ACLs pour le routage HTTP ?",
+    "Configurer les timeouts client/server ?",
+    "Activer les statistiques avec stats enable ?",
+]
+
+# Profondeur RAG par défaut (valeur initiale du slider top-k)
+DEFAULT_TOP_K = 5
+
+# Message de bienvenue (valeur initiale du chatbot et après effacement)
+WELCOME_MESSAGE = """
+    👋 Bonjour ! Je suis l'assistant HAProxy 3.2.
+
+    Je peux t'aider avec :
+    - Configuration des backends et frontends
+    - Health checks et monitoring
+    - ACLs et routage HTTP
+    - SSL/TLS et terminaison TLS
+    - Performance et optimisation
+    - Et bien plus encore !
+
+    Pose-moi une question sur HAProxy 3.2 🚀
+    """
+
+# Pied de page (liens vers la documentation)
+FOOTER_HTML = """
+<div class="app-footer">
+    <a href="https://docs.haproxy.org/3.2/" target="_blank">📚 docs.haproxy.org</a> •
+    <a href="https://github.com/haproxy/haproxy" target="_blank">💻 GitHub</a>
+</div>
+"""
+
+
+def get_welcome_message() -> str:
+    """Retourne le message de bienvenue HTML.
+
+    Returns:
+        Message de bienvenue formaté en HTML
+    """
+    return WELCOME_MESSAGE
+
 
 def build_header() -> gr.Markdown:
     """Construit le header de l'application.
@@ -26,6 +71,15 @@ def build_header() -> gr.Markdown:
     )
 
 
+def build_footer() -> gr.HTML:
+    """Construit le pied de page.
+
+    Returns:
+        Composant Gradio HTML avec les liens
+    """
+    return gr.HTML(FOOTER_HTML)
+
+
 def build_config_panel(
     available_models: list[str] | None = None,
 ) -> tuple[gr.Group, gr.Dropdown, gr.Slider, gr.Checkbox]:
@@ -38,8 +92,11 @@ def build_config_panel(
         Tuple (panel, model_dropdown, top_k_slider, show_sources)
     """
     # Utiliser les modèles fournis ou récupérer les modèles disponibles depuis Ollama
+    # (même liste, mise en cache, que LLMService.list_models)
     if available_models is None:
-        available_models = get_available_models()
+        from llm import list_ollama_models
+
+        available_models = list_ollama_models()
 
     # Sélectionner le modèle par défaut depuis config.py
     default_model = (
@@ -58,7 +115,11 @@ def build_config_panel(
         )
 
         top_k_slider = gr.Slider(
-            minimum=1, maximum=15, value=5, step=1, label="Profondeur (top-k)"
+            minimum=1,
+            maximum=15,
+            value=DEFAULT_TOP_K,
+            step=1,
+            label="Profondeur (top-k)",
         )
 
         show_sources = gr.Checkbox(value=True, label="📚 Afficher les sources")
@@ -72,15 +133,6 @@ def build_examples_panel() -> tuple[gr.Group, list[gr.Button]]:
     Returns:
         Tuple (panel, example_buttons)
     """
-    examples = [
-        "Comment configurer un health check HTTP ?",
-        "Syntaxe de la directive bind avec SSL ?",
-        "Limiter les connexions par IP avec stick-table ?",
-        "Utiliser les ACLs pour le routage HTTP ?",
-        "Configurer les timeouts client/server ?",
-        "Activer les statistiques avec stats enable ?",
-    ]
-
     with gr.Group(elem_classes="examples-panel") as panel:
         gr.Markdown("### 💡 Exemples")
 
@@ -91,12 +143,58 @@ def build_examples_panel() -> tuple[gr.Group, list[gr.Button]]:
                 variant="secondary",
                 elem_classes="example-card",
             )
-            for example in examples
+            for example in EXAMPLE_QUESTIONS
         ]
 
     return panel, example_buttons
 
 
+def build_index_status_panel() -> gr.Markdown:
+    """Construit l'indicateur d'état des index.
+
+    Affiche un état neutre : il est mis à jour au chargement de la page
+    (demo.load), sans bloquer le premier rendu de l'UI.
+
+    Returns:
+        Composant Gradio Markdown
+    """
+    return gr.Markdown("⏳ Chargement des index...", elem_classes="index-status")
+
+
+def build_cache_stats_panel() -> gr.Markdown:
+    """Construit l'encart des statistiques du cache de retrieval.
+
+    Returns:
+        Composant Gradio Markdown mis à jour après chaque réponse
+    """
+    return gr.Markdown(format_cache_stats(None), elem_classes="cache-stats")
+
+
+def format_cache_stats(stats: dict | None) -> str:
+    """Formate les statistiques du cache de retrieval en Markdown.
+
+    Args:
+        stats: Compteurs retournés par RAGService.get_cache_stats()
+
+    Returns:
+        Statistiques formatées en Markdown
+    """
+    if stats is None:
+        return "### 🗄️ Cache\n\nAucune requête pour l'instant"
+
+    storage = "mémoire + disque" if stats["persistent"] else "mémoire"
+    return (
+        "### 🗄️ Cache\n\n"
+        f"- Hits mémoire : {stats['hits_memory']}\n"
+        f"- Hits disque : {stats['hits_disk']}\n"
+        f"- Hits sémantiques : {stats['hits_semantic']}\n"
+        f"- Fallbacks servis par le cache : {stats['hits_low_confidence']}\n"
+        f"- Misses : {stats['misses']}\n"
+        f"- Taux de hit : {stats['hit_rate']:.0%}\n"
+        f"- Entrées ({storage}) : {stats['memory_size']}"
+    )
+
+
 def build_chat_area() -> tuple:
     """Construit la zone de chat principale.
 
@@ -130,30 +228,9 @@ def build_chat_area() -> tuple:
             value=[
                 gr.ChatMessage(
                     role="assistant",
-                    content=[{"type": "text", "text": get_welcome_message()}],
+                    content=[{"type": "text", "text": WELCOME_MESSAGE}],
                 )
             ],
         )
 
     return chat_area, msg_input, send_btn, clear_btn, chatbot
-
-
-def get_welcome_message() -> str:
-    """Retourne le message de bienvenue HTML.
-
-    Returns:
-        Message de bienvenue formaté en HTML
-    """
-    return """
-    👋 Bonjour ! Je suis l'assistant HAProxy 3.2.
-
-    Je peux t'aider avec :
-    - Configuration des backends et frontends
-    - Health checks et monitoring
-    - ACLs et routage HTTP
-    - SSL/TLS et terminaison TLS
-    - Performance et optimisation
-    - Et bien plus encore !
-
-    Pose-moi une question sur HAProxy 3.2 🚀
-    """
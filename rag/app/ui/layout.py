@@ -1,28 +1,78 @@
 """Layout for HAProxy Chatbot UI."""
 
+import json
+import logging
+import traceback
+
 import gradio as gr
 
 from app.ui.components import (
     build_header,
+    build_footer,
     build_config_panel,
     build_examples_panel,
     build_chat_area,
+    build_cache_stats_panel,
+    build_index_status_panel,
+    format_cache_stats,
+    EXAMPLE_QUESTIONS,
 )
 from app.services.chat_service import ChatService
 from app.utils.logging import setup_logging
+from config import chatbot_config
 
 logger = setup_logging(__name__)
 
 
-def build_ui(chat_service: ChatService) -> gr.Blocks:
+def extract_message_text(message) -> str:
+    """Extrait le texte d'un message Gradio, quel que soit son format.
+
+    Un seul `match` (chaîne, None, dict, liste de blocs, objet) plutôt qu'une
+    cascade de isinstance/hasattr ; le cas str, le plus fréquent, est testé
+    en premier.
+
+    Args:
+        message: Chaîne, dict, liste de blocs ou gr.ChatMessage
+
+    Returns:
+        Texte du message
+    """
+    match message:
+        case str():
+            return message
+        case None:
+            return ""
+        case dict():
+            # Bloc ou message dict : {"text": ...} ou {"content": ...}
+            value = message.get("text") or message.get("content") or ""
+            return value if type(value) is str else extract_message_text(value)
+        case list():
+            # Gradio 6.x : [{"type": "text", "text": ...}, ...]
+            return " ".join(extract_message_text(block) for block in message)
+        case _:
+            # gr.ChatMessage ou équivalent
+            content = getattr(message, "content", None)
+            if content is None:
+                return str(message)
+            return extract_message_text(content)
+
+
+def build_ui(
+    chat_service: ChatService, available_models: list[str] | None = None
+) -> gr.Blocks:
     """Construit l'interface utilisateur complète.
 
     Args:
         chat_service: Service de chat injecté
+        available_models: Modèles LLM disponibles (récupérés via le service
+            LLM si non fournis)
 
     Returns:
         Instance de gr.Blocks
     """
+    if available_models is None:
+        available_models = chat_service.llm.list_models()
+
     with gr.Blocks(
         title="HAProxy Docs Chatbot",
         fill_width=True,
@@ -35,8 +85,6 @@ def build_ui(chat_service: ChatService) -> gr.Blocks:
         with gr.Row(equal_height=False):
             # Sidebar
             with gr.Column(scale=1, min_width=280):
-                # Récupérer les modèles disponibles
-                available_models = chat_service.llm.list_models()
                 (
                     config_panel,
                     model_dropdown,
@@ -44,6 +92,8 @@ def build_ui(chat_service: ChatService) -> gr.Blocks:
                     show_sources,
                 ) = build_config_panel(available_models=available_models)
                 examples_panel, example_buttons = build_examples_panel()
+                index_status = build_index_status_panel()
+                cache_stats = build_cache_stats_panel()
 
             # Chat area
             with gr.Column(scale=4):
@@ -56,14 +106,7 @@ def build_ui(chat_service: ChatService) -> gr.Blocks:
                 ) = build_chat_area()
 
         # Footer
-        gr.HTML(
-            """
-            <div class="app-footer">
-                <a href="https://docs.haproxy.org/3.2/" target="_blank">📚 docs.haproxy.org</a> •
-                <a href="https://github.com/haproxy/haproxy" target="_blank">💻 GitHub</a>
-            </div>
-            """
-        )
+        build_footer()
 
         # Event wiring
         _wire_events(
@@ -77,6 +120,8 @@ def build_ui(chat_service: ChatService) -> gr.Blocks:
             top_k_slider,
             show_sources,
             example_buttons,
+            index_status,
+            cache_stats,
         )
 
     return demo
@@ -93,6 +138,8 @@ def _wire_events(
     top_k_slider: gr.Slider,
     show_sources: gr.Checkbox,
     example_buttons: list[gr.Button],
+    index_status: gr.Markdown,
+    cache_stats: gr.Markdown,
 ) -> None:
     """Connecte les événements de l'interface.
 
@@ -107,8 +154,10 @@ def _wire_events(
         top_k_slider: Slider de profondeur RAG
         show_sources: Checkbox d'affichage des sources
         example_buttons: Liste des boutons d'exemple
+        index_status: Indicateur d'état des index
+        cache_stats: Encart des statistiques du cache de retrieval
     """
-    from app.ui.components import get_welcome_message
+    from app.ui.components import WELCOME_MESSAGE
     from app.state.models import ChatConfig
 
     # Session ID par défaut (à améliorer avec uuid.uuid4() si nécessaire)
@@ -117,41 +166,32 @@ def _wire_events(
     def handle_submit(
         message: str,
         history: list[gr.ChatMessage],
-        model_name: str,
-        top_k: int,
-        show_sources_flag: bool,
-    ) -> list[gr.ChatMessage]:
+    ) -> tuple[list[gr.ChatMessage], str]:
         """Ajoute le message utilisateur à l'historique.
 
         Args:
             message: Message utilisateur
             history: Historique de conversation
-            model_name: Nom du modèle LLM
-            top_k: Profondeur RAG
-            show_sources_flag: Afficher les sources
 
         Returns:
-            Historique mis à jour
+            Tuple (historique mis à jour, texte du message pour handle_respond)
         """
-        logger.info("[DEBUG] handle_submit called with message: %s", message)
-        logger.info("[DEBUG] message type: %s", type(message))
-        logger.info("[DEBUG] history length: %d", len(history) if history else 0)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "handle_submit: message=%r (%s), history length=%d",
+                message,
+                type(message).__name__,
+                len(history) if history else 0,
+            )
 
         # Extraire le texte du message
-        if hasattr(message, "content"):
-            message_text = message.content
-        elif isinstance(message, dict):
-            message_text = message.get("content", "")
-        elif isinstance(message, str):
-            message_text = message
-        else:
-            message_text = str(message)
+        message_text = extract_message_text(message)
 
-        logger.info("[DEBUG] message_text extracted: %s", message_text)
+        logger.debug("message_text extracted: %s", message_text)
 
         if not message_text.strip():
-            logger.warning("[DEBUG] message_text is empty, returning history unchanged")
-            return history
+            logger.warning("message_text is empty, returning history unchanged")
+            return history, ""
 
         # Ajouter le message utilisateur à l'historique
         # Dans Gradio 6.x, le content doit être une liste de blocs
@@ -160,10 +200,11 @@ def _wire_events(
                 role="user", content=[{"type": "text", "text": message_text}]
             )
         )
-        logger.info("[DEBUG] message added to history, new length: %d", len(history))
-        return history
+        logger.debug("message added to history, new length: %d", len(history))
+        return history, message_text
 
     async def handle_respond(
+        message: str,
         history: list[gr.ChatMessage],
         model_name: str,
         top_k: int,
@@ -172,6 +213,7 @@ def _wire_events(
         """Génère la réponse de l'assistant avec streaming.
 
         Args:
+            message: Texte du message utilisateur (extrait par handle_submit)
             history: Historique de conversation
             model_name: Nom du modèle LLM
             top_k: Profondeur RAG
@@ -180,58 +222,25 @@ def _wire_events(
         Yields:
             Historique mis à jour à chaque token
         """
-        logger.info("[DEBUG] handle_respond called")
-        logger.info("[DEBUG] history length: %d", len(history) if history else 0)
-        logger.info("[DEBUG] model_name: %s", model_name)
-        logger.info("[DEBUG] top_k: %d", top_k)
-        logger.info("[DEBUG] show_sources_flag: %s", show_sources_flag)
-
-        # Vérifier qu'il y a un message utilisateur valide
-        # Dans Gradio 6.x, le rôle peut être None ou "user"
-        if not history or not history[-1]:
-            logger.warning(
-                "[DEBUG] No history or last message, returning history unchanged"
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "handle_respond: history length=%d, model=%s, top_k=%d, sources=%s",
+                len(history) if history else 0,
+                model_name,
+                top_k,
+                show_sources_flag,
             )
-            yield history
-            return
 
-        # Extraire le message utilisateur
-        user_message = history[-1]
-
-        # Vérifier le contenu du message
-        # Dans Gradio 6.x, le content peut être une liste d'objets ou une chaîne
-        if hasattr(user_message, "content"):
-            content = user_message.content
-        elif isinstance(user_message, dict):
-            content = user_message.get("content", "")
-        else:
-            content = str(user_message)
-
-        # Si content est une liste, extraire le texte
-        if isinstance(content, list):
-            # Gradio 6.x: content est une liste d'objets avec 'text' et 'type'
-            text_parts = []
-            for item in content:
-                if isinstance(item, dict):
-                    text_parts.append(item.get("text", ""))
-                else:
-                    text_parts.append(str(item))
-            content = " ".join(text_parts)
-
-        if not content or not content.strip():
+        # Le texte a déjà été extrait par handle_submit (gr.State) : pas de
+        # second parcours du dernier message de l'historique
+        if not history or not message or not message.strip():
             logger.warning(
-                "[DEBUG] No valid content in last message, returning history unchanged"
+                "No valid user message, returning history unchanged"
             )
             yield history
             return
 
-        logger.info("[DEBUG] Valid user message found: %s", content[:50])
-
-        # Le message utilisateur a déjà été extrait dans la variable 'content'
-        # Utiliser 'content' directement pour le traitement
-        message = content
-
-        logger.info("[DEBUG] User message: %s", message)
+        logger.debug("User message: %s", message)
 
         # Créer la configuration
         config = ChatConfig(
@@ -240,7 +249,7 @@ def _wire_events(
             show_sources=show_sources_flag,
             temperature=0.1,
         )
-        logger.info("[DEBUG] Config created: %s", config)
+        logger.debug("Config created: %s", config)
 
         # Ajouter un message assistant vide pour le streaming
         # Dans Gradio 6.x, le content doit être une liste de blocs
@@ -255,100 +264,106 @@ def _wire_events(
                 ],
             )
         )
-        logger.info("[DEBUG] Assistant message added for streaming")
         yield history
 
         # Vider le message et commencer le streaming
-        # Dans Gradio 6.x, le content doit être une liste de blocs
-        history[-1].content = [{"type": "text", "text": ""}]
-        logger.info("[DEBUG] Starting streaming...")
+        # Dans Gradio 6.x, le content doit être une liste de blocs. Le bloc
+        # texte est créé une fois puis modifié en place à chaque rafraîchissement
+        text_block = {"type": "text", "text": ""}
+        history[-1].content = [text_block]
+        logger.debug("Starting streaming...")
 
         try:
-            logger.info("[DEBUG] Calling chat_service.process_message")
             async for response in chat_service.process_message(
                 message=message,
                 session_id=session_id,
                 config=config,
             ):
-                logger.info(
-                    "[DEBUG] Received response chunk: %s",
-                    response[:50] if response else "empty",
-                )
-                # Dans Gradio 6.x, le content doit être une liste de blocs
-                history[-1].content = [{"type": "text", "text": response}]
+                text_block["text"] = response
                 yield history
-            logger.info("[DEBUG] Streaming completed")
+            logger.debug("Streaming completed")
         except Exception as e:
             logger.error("Error in handle_respond: %s", e)
-            import traceback
-
             traceback.print_exc()
-            # Dans Gradio 6.x, le content doit être une liste de blocs
-            history[-1].content = [
-                {"type": "text", "text": f"❌ **Erreur de génération**\n\n{str(e)}"}
-            ]
+            text_block["text"] = f"❌ **Erreur de génération**\n\n{str(e)}"
             yield history
 
-    def handle_clear() -> list[gr.ChatMessage]:
+    async def handle_clear() -> list[gr.ChatMessage]:
         """Efface l'historique de la session.
 
         Returns:
             Historique réinitialisé avec le message de bienvenue
         """
-        import asyncio
+        # Exécuté sur la boucle d'événements de Gradio, comme les verrous
+        # asyncio du StateManager
+        await chat_service.clear_session(session_id)
 
-        # Créer une nouvelle boucle d'événements si nécessaire
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Exécuter la fonction async
-        loop.run_until_complete(chat_service.clear_session(session_id))
-
-        # Dans Gradio 6.x, le content doit être une liste de blocs
+        # Dans Gradio 6.x, le content doit être une liste de blocs. Nouvelle
+        # liste à chaque appel, le texte est la constante du module
         return [
             gr.ChatMessage(
                 role="assistant",
-                content=[{"type": "text", "text": get_welcome_message()}],
+                content=[{"type": "text", "text": WELCOME_MESSAGE}],
             )
         ]
 
-    # Submit sur msg_input
-    msg_input.submit(
-        fn=handle_submit,
-        inputs=[msg_input, chatbot, model_dropdown, top_k_slider, show_sources],
-        outputs=[chatbot],
-    ).then(
-        fn=handle_respond,
-        inputs=[chatbot, model_dropdown, top_k_slider, show_sources],
-        outputs=[chatbot],
-    )
+    async def handle_model_warm(model_name: str) -> None:
+        """Charge le modèle sélectionné dans Ollama à l'ouverture de la page.
+
+        Args:
+            model_name: Nom du modèle LLM
+        """
+        chat_service.llm.warm(model_name)
+
+    async def handle_index_status() -> str:
+        """Met à jour l'indicateur d'état une fois les index chargés.
+
+        Returns:
+            Message d'état des index
+        """
+        _, status = await chat_service.rag.index_status()
+        return status
+
+    def handle_cache_stats() -> str:
+        """Rafraîchit l'encart des statistiques du cache.
 
-    # Click sur send_btn
-    send_btn.click(
+        Returns:
+            Statistiques formatées en Markdown
+        """
+        return format_cache_stats(chat_service.rag.get_cache_stats())
+
+    # Submit sur msg_input ou click sur send_btn : une seule chaîne
+    # d'événements pour les deux déclencheurs. Le texte extrait transite
+    # de handle_submit à handle_respond par un gr.State
+    pending_text = gr.State("")
+    gr.on(
+        triggers=[msg_input.submit, send_btn.click],
         fn=handle_submit,
-        inputs=[msg_input, chatbot, model_dropdown, top_k_slider, show_sources],
-        outputs=[chatbot],
+        inputs=[msg_input, chatbot],
+        outputs=[chatbot, pending_text],
     ).then(
         fn=handle_respond,
-        inputs=[chatbot, model_dropdown, top_k_slider, show_sources],
+        inputs=[pending_text, chatbot, model_dropdown, top_k_slider, show_sources],
         outputs=[chatbot],
-    )
+        concurrency_id="gen",
+        concurrency_limit=chatbot_config.generation_concurrency,
+    ).then(fn=handle_cache_stats, outputs=[cache_stats])
+
+    # État des index : rendu après l'affichage de la page, par client
+    demo.load(fn=handle_index_status, outputs=[index_status])
+
+    # Modèle sélectionné chargé dans Ollama pendant que l'utilisateur écrit
+    demo.load(fn=handle_model_warm, inputs=[model_dropdown], queue=False)
 
     # Click sur clear_btn
     clear_btn.click(fn=handle_clear, outputs=[chatbot])
 
-    # Click sur les boutons d'exemple
-    examples = [
-        "Comment configurer un health check HTTP ?",
-        "Syntaxe de la directive bind avec SSL ?",
-        "Limiter les connexions par IP avec stick-table ?",
-        "Utiliser les ACLs pour le routage HTTP ?",
-        "Configurer les timeouts client/server ?",
-        "Activer les statistiques avec stats enable ?",
-    ]
-
-    for btn, example_text in zip(example_buttons, examples):
-        btn.click(fn=lambda text=example_text: text, inputs=None, outputs=msg_input)
+    # Click sur les boutons d'exemple : remplissage de la zone de saisie côté
+    # navigateur (js), sans aller-retour serveur
+    for btn, example_text in zip(example_buttons, EXAMPLE_QUESTIONS):
+        btn.click(
+            fn=None,
+            inputs=None,
+            outputs=msg_input,
+            js=f"() => {json.dumps(example_text)}",
+        )
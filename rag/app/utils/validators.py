@@ -1,6 +1,7 @@
 """Input validation for HAProxy Chatbot."""
 
 import re
+from collections.abc import Iterable
 
 from app.utils.errors import ValidationError
 from app.utils.logging import setup_logging
@@ -25,15 +26,38 @@ class InputValidator:
         (r"<[^>]*>", "HTML tags"),
     ]
 
-    def __init__(self, max_length: int = 2000, min_length: int = 1):
+    # Versions compilées une seule fois (validate est appelé à chaque message)
+    _COMPILED_PATTERNS = [
+        (re.compile(pattern, re.IGNORECASE | re.DOTALL), description)
+        for pattern, description in DANGEROUS_PATTERNS
+    ]
+    _CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+    def __init__(
+        self,
+        max_length: int = 2000,
+        min_length: int = 1,
+        trusted: Iterable[str] = (),
+    ):
         """Initialise le validateur.
 
         Args:
             max_length: Longueur maximale d'une requête
             min_length: Longueur minimale d'une requête
+            trusted: Requêtes connues (ex: questions d'exemple), validées une
+                fois ici puis acceptées telles quelles par `validate`
         """
         self.max_length = max_length
         self.min_length = min_length
+        self._trusted: frozenset[str] = frozenset()
+        self._trusted = frozenset(query for query in trusted if self._is_clean(query))
+
+    def _is_clean(self, query: str) -> bool:
+        """Indique si la validation laisse la requête inchangée."""
+        try:
+            return self.validate(query) == query
+        except ValidationError:
+            return False
 
     def validate(self, query: str) -> str:
         """Valide et nettoie une requête utilisateur.
@@ -51,6 +75,10 @@ class InputValidator:
         if not isinstance(query, str):
             raise ValidationError("Query must be a string")
 
+        # Requête connue et déjà validée (boutons d'exemple)
+        if query in self._trusted:
+            return query
+
         # Strip whitespace
         query = query.strip()
 
@@ -63,13 +91,13 @@ class InputValidator:
             query = query[: self.max_length]
 
         # Remove dangerous patterns
-        for pattern, description in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, query, re.IGNORECASE | re.DOTALL):
+        for pattern, description in self._COMPILED_PATTERNS:
+            if pattern.search(query):
                 logger.warning("Query contains %s, removing", description)
-                query = re.sub(pattern, "", query, flags=re.IGNORECASE | re.DOTALL)
+                query = pattern.sub("", query)
 
         # Remove control characters
-        query = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", query)
+        query = self._CONTROL_CHARS.sub("", query)
 
         # Final check
         if not query.strip():
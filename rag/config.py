@@ -24,6 +24,10 @@ class OllamaConfig:
     max_retries: int = int(os.getenv("OLLAMA_MAX_RETRIES", "3"))
     rate_limit_calls_per_minute: int = int(os.getenv("OLLAMA_RATE_LIMIT", "30"))
 
+    # Requêtes traitées en parallèle par `ollama serve` (variable lue par le
+    # serveur Ollama lui-même ; à exporter avant de le lancer)
+    num_parallel: int = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
 
 @dataclass
 class RetrievalConfig:
@@ -47,6 +51,9 @@ class RetrievalConfig:
     # Activer/désactiver FlashRank
     disable_flashrank: bool = os.getenv("DISABLE_FLASHRANK", "false").lower() == "true"
 
+    # Taille du cache LRU des embeddings de requêtes (0 = désactivé)
+    embedding_cache_size: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+
 
 @dataclass
 class BoostingConfig:
@@ -159,6 +166,14 @@ class LLMConfig:
     # Rate limiting pour les appels LLM
     rate_limit_calls_per_minute: int = int(os.getenv("LLM_RATE_LIMIT", "20"))
 
+    # Durée de maintien du modèle en mémoire Ollama entre deux requêtes.
+    # Un modèle résident réutilise le cache KV du préfixe commun (prompt
+    # système + historique) au lieu de tout recalculer à chaque tour.
+    keep_alive: str = os.getenv("LLM_KEEP_ALIVE", "30m")
+
+    # Durée de validité (secondes) de la liste des modèles Ollama mise en cache
+    models_cache_ttl: float = float(os.getenv("LLM_MODELS_CACHE_TTL", "60"))
+
 
 @dataclass
 class ValidationConfig:
@@ -188,6 +203,58 @@ class LoggingConfig:
     log_file: str = os.getenv("LOG_FILE", "")
 
 
+@dataclass
+class CacheConfig:
+    """Configuration du cache de retrieval du chatbot (retrieval_cache.py)."""
+
+    # Entrées du cache LRU en mémoire (0 = désactivé)
+    retrieval_cache_size: int = int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024"))
+
+    # Fichier SQLite persistant ("" = pas de persistance)
+    retrieval_cache_path: str = os.getenv(
+        "RETRIEVAL_CACHE_PATH", "~/.cache/haproxy_rag/retrieval.sqlite"
+    )
+
+    # Cache sémantique : questions quasi identiques (similarité cosinus des
+    # embeddings >= seuil). Taille max, éviction FIFO (0 = désactivé)
+    semantic_cache_size: int = int(os.getenv("SEMANTIC_CACHE_SIZE", "2048"))
+    semantic_cache_threshold: float = float(
+        os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")
+    )
+
+    # Réponses LLM du benchmark de correction (07_bench_config_correction.py),
+    # clé (modèle, contexte, prompt) ("" = pas de cache)
+    bench_response_cache_path: str = os.getenv(
+        "BENCH_RESPONSE_CACHE_PATH", "~/.cache/haproxy_rag/bench_responses.sqlite"
+    )
+
+
+@dataclass
+class ChatbotConfig:
+    """Configuration de l'interface Gradio (04_chatbot.py)."""
+
+    # Nombre d'événements traités en parallèle par défaut
+    queue_concurrency: int = int(os.getenv("CHATBOT_QUEUE_CONCURRENCY", "8"))
+
+    # Taille maximale de la file d'attente (au-delà, les requêtes sont refusées)
+    queue_max_size: int = int(os.getenv("CHATBOT_QUEUE_MAX_SIZE", "64"))
+
+    # Générations LLM simultanées (protège l'unique processus Ollama).
+    # Par défaut alignée sur OLLAMA_NUM_PARALLEL : au-delà, Ollama met en file
+    generation_concurrency: int = int(
+        os.getenv(
+            "CHATBOT_GENERATION_CONCURRENCY", os.getenv("OLLAMA_NUM_PARALLEL", "4")
+        )
+    )
+
+    # Micro-batching des embeddings de requêtes des utilisateurs simultanés :
+    # au plus embed_batch_size requêtes regroupées, attente max embed_batch_latency_ms
+    embed_batch_size: int = int(os.getenv("CHATBOT_EMBED_BATCH_SIZE", "8"))
+    embed_batch_latency_ms: float = float(
+        os.getenv("CHATBOT_EMBED_BATCH_LATENCY_MS", "20")
+    )
+
+
 # Instances globales avec valeurs par défaut
 ollama_config = OllamaConfig()
 retrieval_config = RetrievalConfig()
@@ -199,6 +266,8 @@ index_config = IndexConfig()
 llm_config = LLMConfig()
 validation_config = ValidationConfig()
 logging_config = LoggingConfig()
+cache_config = CacheConfig()
+chatbot_config = ChatbotConfig()
 
 
 # Aliases pour compatibilité ascendante (à déprécier)
@@ -6,6 +6,7 @@ configuration HAProxy sans nécessiter l'installation de HAProxy lui-même.
 """
 
 import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import ClassVar
@@ -203,13 +204,17 @@ class HAProxyValidator:
         "acl_allow_all": r"^\s*acl\s+\S+\s+src\s+0\.0\.0\.0/0\b",
     }
 
-    def __init__(self, strict_mode: bool = False) -> None:
+    def __init__(self, strict_mode: bool = False, cache_size: int = 256) -> None:
         """Initialise le validateur.
 
         Args:
             strict_mode: Si True, le validateur est plus strict dans les validations
+            cache_size: Nombre de résultats de `validate` gardés en mémoire
+                (LRU, 0 = désactivé)
         """
         self.strict_mode = strict_mode
+        self.cache_size = cache_size
+        self._results: OrderedDict[str, ValidationResult] = OrderedDict()
         self.current_section: str | None = None
         self.section_name: str | None = None
         self.defined_backends: set[str] = set()
@@ -221,12 +226,33 @@ class HAProxyValidator:
     def validate(self, config: str) -> ValidationResult:
         """Valide une configuration HAProxy complète.
 
+        Le résultat ne dépend que du texte de la configuration : il est mis en
+        cache, une même configuration (ex: évaluée par plusieurs métriques)
+        n'est analysée qu'une fois. Le résultat retourné est partagé et ne
+        doit pas être modifié.
+
         Args:
             config: Configuration HAProxy sous forme de chaîne de caractères
 
         Returns:
             ValidationResult contenant les erreurs, warnings et infos détectés
         """
+        if self.cache_size <= 0:
+            return self._validate(config)
+
+        result = self._results.get(config)
+        if result is not None:
+            self._results.move_to_end(config)
+            return result
+
+        result = self._validate(config)
+        self._results[config] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    def _validate(self, config: str) -> ValidationResult:
+        """Analyse effective d'une configuration (sans cache)."""
         errors: list[ValidationError] = []
         warnings: list[ValidationError] = []
         info: list[ValidationError] = []
@@ -3,18 +3,31 @@ llm.py - Génération de réponses via Ollama avec streaming
 Utilise le contexte récupéré par le retriever pour répondre avec précision.
 """
 
+import asyncio
+import json
 import os
 import requests
 from datetime import datetime, timedelta
 import time
-from typing import Generator
+from typing import AsyncGenerator, Generator
 import logging
 
+import httpx
+
 # Import configuration depuis config.py
 from config import ollama_config, llm_config
 
 logger = logging.getLogger(__name__)
 
+# orjson est optionnel (`uv add orjson`) : décodage des lignes NDJSON du
+# streaming ~3x plus rapide, directement depuis les bytes (pas de decode())
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # ── HTTP Session Pooling ─────────────────────────────────────────────────────
 # Session globale pour le pooling de connexions HTTP
@@ -28,6 +41,22 @@ _llm_session.mount(
     ),
 )
 
+# Client asynchrone partagé (streaming du chatbot), créé au premier usage sur
+# la boucle d'événements de Gradio : les connexions keep-alive vers Ollama
+# sont réutilisées d'un tour à l'autre
+_async_client: httpx.AsyncClient | None = None
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Retourne le client httpx asynchrone partagé (recréé s'il a été fermé)."""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=LLM_TIMEOUT,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
+    return _async_client
+
 
 # ── Rate Limiting ───────────────────────────────────────────────────────────
 class RateLimiter:
@@ -51,10 +80,11 @@ _llm_limiter = RateLimiter(calls_per_minute=20)
 
 
 # ── Config ───────────────────────────────────────────────────────────────────
-OLLAMA_URL = ollama_config.base_url
+OLLAMA_URL = ollama_config.url
 DEFAULT_MODEL = llm_config.default_model
 MAX_CONTEXT_CHARS = llm_config.max_context_chars
-LLM_TIMEOUT = llm_config.llm_timeout
+LLM_TIMEOUT = ollama_config.llm_timeout
+KEEP_ALIVE = llm_config.keep_alive
 
 
 # ── Prompt système ────────────────────────────────────────────────────────────
@@ -106,29 +136,108 @@ Suggestions :
 - Vérifie que le terme recherché existe dans HAProxy 3.2"""
 
 
-def list_ollama_models() -> list[str]:
+def _fetch_ollama_models() -> list[str]:
+    """Interroge /api/tags et filtre les modèles (lève en cas d'erreur)."""
+    response = _llm_session.get(f"{OLLAMA_URL}/api/tags", timeout=5)
+    response.raise_for_status()
+    all_models = [m["name"] for m in response.json().get("models", [])]
+
+    # Filtrer les modèles d'embedding et vision-language
+    return [
+        model
+        for model in all_models
+        if "embed" not in model.lower() and "vl" not in model.lower()
+    ]
+
+
+# Cache (horodatage monotonic, modèles) de list_ollama_models
+_models_cache: tuple[float, list[str]] | None = None
+
+
+def list_ollama_models(ttl: float | None = None) -> list[str]:
     """Retourne la liste des modèles Ollama disponibles, filtrée.
 
     Exclut les modèles d'embedding et les modèles vision-language (vl).
+    Le résultat est mis en cache `ttl` secondes : l'UI la demande à
+    plusieurs endroits (et à chaque reconstruction), mais un `ollama pull`
+    apparaît quand même sans redémarrer le chatbot. Les échecs ne sont pas
+    mis en cache.
+
+    Args:
+        ttl: Durée de validité du cache en secondes (défaut :
+            llm_config.models_cache_ttl)
 
     Returns:
         Liste des noms de modèles disponibles
     """
+    global _models_cache
+    if ttl is None:
+        ttl = llm_config.models_cache_ttl
+    now = time.monotonic()
+    if _models_cache is not None and now - _models_cache[0] < ttl:
+        return list(_models_cache[1])
+
+    try:
+        models = _fetch_ollama_models()
+    except Exception:
+        return []
+
+    _models_cache = (now, models)
+    return list(models)
+
+
+def warmup_model(model: str = DEFAULT_MODEL) -> bool:
+    """
+    Charge le modèle en mémoire Ollama avec une génération d'un seul token.
+
+    Évite au premier utilisateur de payer le chargement à froid (plusieurs
+    secondes pour un modèle 8B) ; `keep_alive` le garde ensuite résident.
+
+    Returns:
+        True si le modèle a répondu
+    """
     try:
-        response = _llm_session.get(f"{OLLAMA_URL}/api/tags", timeout=5)
+        response = _llm_session.post(
+            f"{OLLAMA_URL}/api/generate",
+            json={
+                "model": model,
+                "prompt": ".",
+                "stream": False,
+                "options": {"num_predict": 1},
+                "keep_alive": KEEP_ALIVE,
+            },
+            timeout=LLM_TIMEOUT,
+        )
         response.raise_for_status()
-        all_models = [m["name"] for m in response.json().get("models", [])]
+        logger.info("Modèle %s préchargé (keep_alive=%s)", model, KEEP_ALIVE)
+        return True
+    except Exception as e:
+        logger.warning("Préchargement du modèle %s impossible : %s", model, e)
+        return False
 
-        # Filtrer les modèles d'embedding et vision-language
-        filtered_models = [
-            model
-            for model in all_models
-            if "embed" not in model.lower() and "vl" not in model.lower()
-        ]
 
-        return filtered_models
-    except Exception:
-        return []
+async def aload_model(model: str = DEFAULT_MODEL) -> bool:
+    """
+    Demande à Ollama de charger le modèle, sans rien générer (asynchrone).
+
+    Une requête /api/generate sans prompt charge le modèle (ou prolonge son
+    `keep_alive` s'il est déjà résident) et répond aussitôt. Lancée en même
+    temps que le retrieval, elle retire le chargement à froid du chemin
+    critique de la génération.
+
+    Returns:
+        True si Ollama a répondu
+    """
+    try:
+        response = await _get_async_client().post(
+            f"{OLLAMA_URL}/api/generate",
+            json={"model": model, "keep_alive": KEEP_ALIVE},
+        )
+        response.raise_for_status()
+        return True
+    except Exception as e:
+        logger.debug("Chargement du modèle %s impossible : %s", model, e)
+        return False
 
 
 def truncate_context(context: str, max_chars: int = MAX_CONTEXT_CHARS) -> str:
@@ -160,17 +269,25 @@ def truncate_context(context: str, max_chars: int = MAX_CONTEXT_CHARS) -> str:
 
 
 def build_messages(
-    question: str, context: str, history: list[tuple[str, str]] | None = None
+    question: str,
+    context: str,
+    history: list[tuple[str, str]] | None = None,
+    system_prompt: str = SYSTEM_PROMPT,
 ) -> list[dict]:
     """
     Construit la liste de messages pour l'API Ollama.
 
+    L'ordre (système, historique, puis contexte + question) garde un préfixe
+    stable d'un tour à l'autre : Ollama réutilise son cache KV pour ce préfixe
+    tant que le modèle reste chargé (cf. `keep_alive`).
+
     Args:
         question : Question actuelle
         context  : Contexte récupéré par le retriever
         history  : Historique [(question, réponse), ...] des 3 derniers tours max
+        system_prompt : Prompt système (défaut : assistant documentation)
     """
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    messages = [{"role": "system", "content": system_prompt}]
 
     # Ajouter l'historique de conversation (max 3 tours)
     if history:
@@ -187,25 +304,21 @@ def build_messages(
     return messages
 
 
-def generate_response(
+def _build_request(
     question: str,
     context: str,
-    model: str = DEFAULT_MODEL,
-    history: list[tuple[str, str]] | None = None,
-    temperature: float = 0.1,  # Faible pour rester factuel
-) -> Generator[str, None, None]:
+    model: str,
+    history: list[tuple[str, str]] | None,
+    temperature: float,
+    system_prompt: str = SYSTEM_PROMPT,
+) -> tuple[str, dict, bool]:
     """
-    Génère une réponse en streaming.
+    Construit l'endpoint et le payload Ollama pour une génération en streaming.
 
-    Yields:
-        Tokens de la réponse au fur et à mesure
+    Returns:
+        Tuple (endpoint, payload, is_gguf)
     """
-    import json  # Pour le parsing du streaming
-
-    # Wait if needed to respect rate limit
-    _llm_limiter.wait_if_needed()
-
-    messages = build_messages(question, context, history)
+    messages = build_messages(question, context, history, system_prompt)
 
     # DEBUG: Afficher les messages
     logger.debug("Messages envoyés à Ollama:")
@@ -217,6 +330,13 @@ def generate_response(
     # Détecter si c'est un modèle GGUF (qui nécessite un format différent)
     is_gguf = "GGUF" in model or "gguf" in model.lower()
 
+    options = {
+        "temperature": temperature,
+        "top_p": 0.9,
+        "repeat_penalty": 1.1,
+        "num_predict": 1024,
+    }
+
     # Pour les modèles GGUF, construire un prompt simple au lieu de messages
     if is_gguf:
         # Construire un prompt simple pour les modèles GGUF
@@ -237,30 +357,61 @@ def generate_response(
             "model": model,
             "prompt": prompt,
             "stream": True,
-            "options": {
-                "temperature": temperature,
-                "top_p": 0.9,
-                "repeat_penalty": 1.1,
-                "num_predict": 1024,
-            },
-            "keep_alive": "5m",  # Keep model loaded for 5 minutes
+            "options": options,
+            "keep_alive": KEEP_ALIVE,
         }
-        endpoint = f"{OLLAMA_URL}/api/generate"
+        return f"{OLLAMA_URL}/api/generate", payload, is_gguf
+
+    # Format standard pour les modèles natifs Ollama
+    payload = {
+        "model": model,
+        "messages": messages,
+        "stream": True,
+        "options": options,
+        "keep_alive": KEEP_ALIVE,
+    }
+    return f"{OLLAMA_URL}/api/chat", payload, is_gguf
+
+
+def _parse_stream_line(line: str | bytes, is_gguf: bool) -> tuple[str, bool]:
+    """
+    Décode une ligne NDJSON du streaming Ollama.
+
+    Returns:
+        Tuple (token, done) — token vide si la ligne est invalide
+    """
+    try:
+        data = _json_loads(line)
+    except ValueError:  # json.JSONDecodeError / orjson.JSONDecodeError
+        return "", False
+    # Les deux endpoints retournent des formats légèrement différents
+    if is_gguf:
+        token = data.get("response", "")
     else:
-        # Format standard pour les modèles natifs Ollama
-        payload = {
-            "model": model,
-            "messages": messages,
-            "stream": True,
-            "options": {
-                "temperature": temperature,
-                "top_p": 0.9,
-                "repeat_penalty": 1.1,
-                "num_predict": 1024,
-            },
-            "keep_alive": "5m",  # Keep model loaded for 5 minutes
-        }
-        endpoint = f"{OLLAMA_URL}/api/chat"
+        token = data.get("message", {}).get("content", "")
+    return token, bool(data.get("done"))
+
+
+def generate_response(
+    question: str,
+    context: str,
+    model: str = DEFAULT_MODEL,
+    history: list[tuple[str, str]] | None = None,
+    temperature: float = 0.1,  # Faible pour rester factuel
+    system_prompt: str = SYSTEM_PROMPT,
+) -> Generator[str, None, None]:
+    """
+    Génère une réponse en streaming.
+
+    Yields:
+        Tokens de la réponse au fur et à mesure
+    """
+    # Wait if needed to respect rate limit
+    _llm_limiter.wait_if_needed()
+
+    endpoint, payload, is_gguf = _build_request(
+        question, context, model, history, temperature, system_prompt
+    )
 
     try:
         with _llm_session.post(
@@ -270,19 +421,11 @@ def generate_response(
 
             for line in response.iter_lines():
                 if line:
-                    try:
-                        data = json.loads(line.decode("utf-8"))
-                        # Les deux endpoints retournent des formats légèrement différents
-                        if is_gguf:
-                            token = data.get("response", "")
-                        else:
-                            token = data.get("message", {}).get("content", "")
-                        if token:
-                            yield token
-                        if data.get("done"):
-                            break
-                    except json.JSONDecodeError:
-                        continue
+                    token, done = _parse_stream_line(line, is_gguf)
+                    if token:
+                        yield token
+                    if done:
+                        break
 
     except requests.exceptions.ConnectionError:
         yield f"❌ Impossible de se connecter à Ollama sur {OLLAMA_URL}.\nVérifie qu'Ollama tourne : `ollama serve`"
@@ -297,6 +440,58 @@ def generate_response(
         yield f"❌ Erreur inattendue : {e}"
 
 
+async def agenerate_response(
+    question: str,
+    context: str,
+    model: str = DEFAULT_MODEL,
+    history: list[tuple[str, str]] | None = None,
+    temperature: float = 0.1,  # Faible pour rester factuel
+    system_prompt: str = SYSTEM_PROMPT,
+) -> AsyncGenerator[str, None]:
+    """
+    Génère une réponse en streaming, version asynchrone (httpx).
+
+    Même payload et mêmes messages d'erreur que `generate_response`, mais le
+    streaming ne bloque pas de thread : l'interface Gradio peut servir
+    plusieurs sessions en parallèle sur la même boucle d'événements. Le
+    client httpx est partagé, les connexions vers Ollama sont réutilisées.
+
+    Yields:
+        Tokens de la réponse au fur et à mesure
+    """
+    # Le rate limiter dort de façon bloquante : le sortir de la boucle
+    await asyncio.to_thread(_llm_limiter.wait_if_needed)
+
+    endpoint, payload, is_gguf = _build_request(
+        question, context, model, history, temperature, system_prompt
+    )
+
+    try:
+        client = _get_async_client()
+        async with client.stream("POST", endpoint, json=payload) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if line:
+                    token, done = _parse_stream_line(line, is_gguf)
+                    if token:
+                        yield token
+                    if done:
+                        break
+
+    except httpx.ConnectError:
+        yield f"❌ Impossible de se connecter à Ollama sur {OLLAMA_URL}.\nVérifie qu'Ollama tourne : `ollama serve`"
+    except httpx.TimeoutException:
+        yield "⏱️ Timeout — le modèle met trop de temps à répondre. Essaie un modèle plus léger."
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            yield f"❌ Modèle '{model}' non trouvé.\nInstalle-le : `ollama pull {model}`"
+        else:
+            yield f"❌ Erreur Ollama : {e}"
+    except Exception as e:
+        yield f"❌ Erreur inattendue : {e}"
+
+
 def generate_response_sync(
     question: str,
     context: str,
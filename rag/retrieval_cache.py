@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+retrieval_cache.py - Cache à deux niveaux pour le retrieval du chatbot
+
+Évite de ré-exécuter le pipeline complet (embedding qwen3-embedding:8b,
+ChromaDB, BM25, RRF, reranking) pour une question déjà posée :
+- Niveau 1 : LRU en mémoire (OrderedDict), lookup sub-milliseconde
+- Niveau 2 : SQLite sur disque, survit aux redémarrages du chatbot
+
+Clé : blake2b(empreinte des index + requête normalisée) + top_k. L'empreinte
+change quand les index sont reconstruits (03_indexing.py), ce qui invalide
+naturellement les anciennes entrées.
+
+En cas de miss exact, un cache sémantique (mémoire uniquement) rattrape les
+reformulations triviales ("Configurer timeouts ?" / "configurer les
+timeouts") : similarité cosinus des embeddings de requêtes >= seuil.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from config import cache_config
+from logging_config import setup_logging
+from retriever_numba import best_match
+
+logger = setup_logging(__name__)
+
+# orjson est optionnel (`uv add orjson`) : sérialisation des sources ~5x plus
+# rapide et plus compacte ; les deux formats se relisent mutuellement
+try:
+    import orjson
+
+    def _dumps_sources(sources: list[dict]) -> bytes:
+        return orjson.dumps(sources)
+
+    _loads_sources = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+
+    def _dumps_sources(sources: list[dict]) -> bytes:
+        return json.dumps(sources, ensure_ascii=False).encode()
+
+    _loads_sources = json.loads
+    ORJSON_AVAILABLE = False
+
+RetrievalResult = tuple[str, list[dict], bool]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS retrieval (
+    hash BLOB NOT NULL,
+    top_k INTEGER NOT NULL,
+    context TEXT NOT NULL,
+    sources_json BLOB NOT NULL,
+    low_conf INTEGER NOT NULL,
+    PRIMARY KEY (hash, top_k)
+)
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Normalise une requête pour le cache (casse et espaces)."""
+    return " ".join(query.lower().split())
+
+
+class SemanticCache:
+    """
+    Cache sémantique : résultats indexés par embedding de requête.
+
+    Les embeddings (normalisés) sont rangés dans une matrice pré-allouée ;
+    un lookup est une seule passe `best_match` (kernel Numba si disponible,
+    sinon produit matrice-vecteur BLAS). Éviction FIFO (anneau).
+    """
+
+    def __init__(self, max_size: int = 2048, threshold: float = 0.92):
+        """
+        Initialise le cache.
+
+        Args:
+            max_size: Nombre maximum d'entrées (0 = désactivé)
+            threshold: Similarité cosinus minimale pour un hit
+        """
+        self.max_size = max_size
+        self.threshold = threshold
+        self._matrix: np.ndarray | None = None  # (max_size, dim), alloué au 1er put
+        self._top_ks = np.zeros(max(max_size, 0), dtype=np.int32)
+        self._payloads: list[RetrievalResult | None] = [None] * max(max_size, 0)
+        self._count = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray | None:
+        """Vecteur unitaire float32, None si la norme est nulle."""
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else None
+
+    def get(self, embedding: list[float], top_k: int) -> RetrievalResult | None:
+        """Résultat de la requête la plus proche si similarité >= seuil."""
+        if self.max_size <= 0:
+            return None
+        query = self._normalize(embedding)
+        with self._lock:
+            if (
+                query is None
+                or self._count == 0
+                or self._matrix.shape[1] != query.shape[0]
+            ):
+                return None
+            best, score = best_match(
+                self._matrix, self._count, self._top_ks, top_k, query
+            )
+            if best >= 0 and score >= self.threshold:
+                return self._payloads[best]
+            return None
+
+    def put(self, embedding: list[float], top_k: int, result: RetrievalResult) -> None:
+        """Ajoute une entrée (remplace la plus ancienne si le cache est plein)."""
+        if self.max_size <= 0:
+            return
+        vec = self._normalize(embedding)
+        if vec is None:
+            return
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != vec.shape[0]:
+                self._matrix = np.zeros((self.max_size, vec.shape[0]), dtype=np.float32)
+                self._count = 0
+                self._next = 0
+            slot = self._next
+            self._matrix[slot] = vec
+            self._top_ks[slot] = top_k
+            self._payloads[slot] = result
+            self._next = (slot + 1) % self.max_size
+            self._count = min(self._count + 1, self.max_size)
+
+    def clear(self) -> None:
+        """Vide le cache (la matrice allouée est conservée)."""
+        with self._lock:
+            self._payloads = [None] * max(self.max_size, 0)
+            self._count = 0
+            self._next = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class RetrievalCache:
+    """Cache LRU mémoire + SQLite des résultats de `retrieve_context_string`."""
+
+    def __init__(
+        self,
+        fingerprint: str,
+        max_size: int = 1024,
+        db_path: Path | None = None,
+        semantic: SemanticCache | None = None,
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            fingerprint: Empreinte des index (incluse dans chaque clé)
+            max_size: Nombre d'entrées du LRU mémoire (0 = désactivé)
+            db_path: Fichier SQLite (None = pas de persistance)
+            semantic: Cache sémantique consulté après un miss exact (optionnel)
+        """
+        self.fingerprint = fingerprint
+        self.max_size = max_size
+        self.semantic = semantic
+        self._memory: OrderedDict[tuple[bytes, int], RetrievalResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.hits_semantic = 0
+        self.hits_low_confidence = 0
+        self.misses = 0
+
+        if db_path is not None:
+            try:
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                # Accès protégé par self._lock : les retrievals tournent
+                # dans les threads du pool de l'event loop
+                self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+                self._db.execute(_SCHEMA)
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning("Cache disque désactivé (%s) : %s", db_path, e)
+                self._db = None
+
+    def _key(self, query: str, top_k: int) -> tuple[bytes, int]:
+        """Clé (hash, top_k) pour une requête."""
+        norm_query = normalize_query(query)
+        digest = hashlib.blake2b(
+            f"{self.fingerprint}\0{norm_query}".encode(), digest_size=16
+        ).digest()
+        return digest, top_k
+
+    def _remember(self, key: tuple[bytes, int], result: RetrievalResult) -> None:
+        """Insère dans le LRU mémoire (appelé sous self._lock)."""
+        if self.max_size <= 0:
+            return
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def get(self, query: str, top_k: int) -> RetrievalResult | None:
+        """
+        Cherche un résultat en mémoire puis sur disque.
+
+        Les hits à faible confiance sont aussi comptés à part : le chatbot
+        répond alors directement le message de fallback, sans retrieval.
+
+        Returns:
+            Tuple (context_str, sources, low_confidence) ou None si absent
+        """
+        key = self._key(query, top_k)
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                self.hits_low_confidence += result[2]
+                return result
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT context, sources_json, low_conf FROM retrieval "
+                        "WHERE hash = ? AND top_k = ?",
+                        key,
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning("Lecture du cache disque impossible : %s", e)
+                    row = None
+                if row is not None:
+                    result = (row[0], _loads_sources(row[1]), bool(row[2]))
+                    self._remember(key, result)
+                    self.hits_disk += 1
+                    self.hits_low_confidence += result[2]
+                    return result
+
+            self.misses += 1
+            return None
+
+    def contains(self, query: str, top_k: int) -> bool:
+        """Indique si un résultat est en cache (sans compter de hit/miss)."""
+        key = self._key(query, top_k)
+        with self._lock:
+            if key in self._memory:
+                return True
+            if self._db is None:
+                return False
+            try:
+                row = self._db.execute(
+                    "SELECT 1 FROM retrieval WHERE hash = ? AND top_k = ?", key
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("Lecture du cache disque impossible : %s", e)
+                return False
+            return row is not None
+
+    def put(self, query: str, top_k: int, result: RetrievalResult) -> None:
+        """Enregistre un résultat en mémoire et sur disque."""
+        key = self._key(query, top_k)
+        context_str, sources, low_confidence = result
+        with self._lock:
+            self._remember(key, result)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO retrieval "
+                    "(hash, top_k, context, sources_json, low_conf) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        key[0],
+                        key[1],
+                        context_str,
+                        _dumps_sources(sources),
+                        int(low_confidence),
+                    ),
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning("Écriture du cache disque impossible : %s", e)
+
+    def get_semantic(
+        self, embedding: list[float], top_k: int
+    ) -> RetrievalResult | None:
+        """
+        Cherche une requête sémantiquement proche, après un miss de `get`.
+
+        Un hit est compté comme tel (et retiré des misses déjà comptés).
+        """
+        if self.semantic is None:
+            return None
+        result = self.semantic.get(embedding, top_k)
+        if result is not None:
+            with self._lock:
+                self.hits_semantic += 1
+                self.hits_low_confidence += result[2]
+                self.misses -= 1
+        return result
+
+    def put_semantic(
+        self, embedding: list[float], top_k: int, result: RetrievalResult
+    ) -> None:
+        """Enregistre un résultat dans le cache sémantique."""
+        if self.semantic is not None:
+            self.semantic.put(embedding, top_k, result)
+
+    def invalidate(self, fingerprint: str) -> None:
+        """
+        Invalide le cache après une reconstruction des index.
+
+        Le LRU mémoire et le cache sémantique sont vidés ; les entrées disque
+        de l'ancienne empreinte ne sont simplement plus jamais lues.
+
+        Args:
+            fingerprint: Nouvelle empreinte des index
+        """
+        with self._lock:
+            self.fingerprint = fingerprint
+            self._memory.clear()
+        if self.semantic is not None:
+            self.semantic.clear()
+
+    def close(self) -> None:
+        """Ferme la connexion SQLite (le LRU mémoire reste utilisable)."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict:
+        """Compteurs du cache (hits mémoire/disque/sémantiques/fallback, misses, taille)."""
+        with self._lock:
+            hits = self.hits_memory + self.hits_disk + self.hits_semantic
+            lookups = hits + self.misses
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "hits_semantic": self.hits_semantic,
+                "hits_low_confidence": self.hits_low_confidence,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_size": len(self._memory),
+                "semantic_size": len(self.semantic) if self.semantic else 0,
+                "persistent": self._db is not None,
+            }
+
+
+_cache: RetrievalCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Retourne le cache du processus (créé à la première utilisation)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from retriever_v3 import index_fingerprint
+
+                db_path = cache_config.retrieval_cache_path
+                _cache = RetrievalCache(
+                    fingerprint=index_fingerprint(),
+                    max_size=cache_config.retrieval_cache_size,
+                    db_path=Path(db_path).expanduser() if db_path else None,
+                    semantic=(
+                        SemanticCache(
+                            max_size=cache_config.semantic_cache_size,
+                            threshold=cache_config.semantic_cache_threshold,
+                        )
+                        if cache_config.semantic_cache_size > 0
+                        else None
+                    ),
+                )
+    return _cache
+
+
+def invalidate_retrieval_cache() -> None:
+    """Invalide le cache du processus (appelé par `retriever_v3.reload_indexes`)."""
+    if _cache is None:
+        return
+    from retriever_v3 import index_fingerprint
+
+    _cache.invalidate(index_fingerprint())
+    logger.info("Cache de retrieval invalidé")
+
+
+def retrieval_cache_stats() -> dict | None:
+    """Statistiques du cache du processus, None s'il n'est pas encore créé."""
+    return _cache.stats() if _cache is not None else None
+
+
+def cached_retrieve_context_string(
+    query: str,
+    top_k: int = 5,
+    embed: Callable[[str], list[float] | None] | None = None,
+    semantic: bool = True,
+) -> RetrievalResult:
+    """
+    `retrieve_context_string` avec cache mémoire + disque.
+
+    Args:
+        query: Requête utilisateur
+        top_k: Nombre de résultats
+        embed: Fonction d'embedding à utiliser après un miss exact (défaut :
+            `embed_query`, seulement si le cache sémantique est actif). Elle
+            doit alimenter le cache LRU des embeddings du retriever.
+        semantic: False pour n'utiliser que le cache exact (benchmarks :
+            une reformulation proche ne doit pas réutiliser un autre résultat)
+
+    Returns:
+        Tuple (context_str, sources, low_confidence)
+    """
+    from retriever_v3 import embed_query, retrieve_context_string
+
+    cache = get_retrieval_cache()
+    result = cache.get(query, top_k)
+    if result is not None:
+        return result
+
+    # Miss exact : essayer le cache sémantique. L'embedding est mis en cache
+    # par le retriever, le retrieval ci-dessous ne le recalcule pas.
+    if not semantic:
+        embedding = None
+    elif embed is not None:
+        embedding = embed(query)
+    elif cache.semantic is not None:
+        embedding = embed_query(query)
+    else:
+        embedding = None
+    if embedding is not None:
+        result = cache.get_semantic(embedding, top_k)
+        if result is not None:
+            return result
+
+    result = retrieve_context_string(query, top_k=top_k)
+    # Les résultats vides (Ollama indisponible, requête rejetée...) ne sont
+    # pas mis en cache : ils doivent pouvoir réussir au prochain essai
+    if result[1]:
+        cache.put(query, top_k, result)
+        if embedding is not None:
+            cache.put_semantic(embedding, top_k, result)
+    return result
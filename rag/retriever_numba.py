@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+retriever_numba.py - Sélection top-k compilée pour le retriever V3
+
+Remplace le tri complet `np.argsort(scores)[::-1][:k]` (O(n log n)) par une
+sélection partielle des k meilleurs scores :
+- Numba disponible : kernel `@njit(parallel=True)`, un tas-min de taille k par
+  thread (`prange`), puis fusion séquentielle des candidats
+- Numba absent : repli NumPy `np.argpartition` (O(n)) + tri des k candidats
+
+Fournit aussi `best_match`, le lookup du cache sémantique (produit scalaire +
+argmax filtré par top_k en une seule passe compilée).
+
+Numba est optionnel : `uv add numba` pour activer le kernel compilé.
+"""
+
+import numpy as np
+from logging_config import setup_logging
+
+logger = setup_logging(__name__)
+
+try:
+    from numba import get_num_threads, njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.debug("numba non disponible, top-k via np.argpartition")
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, nogil=True)
+    def _heap_push(heap_s, heap_i, size, score, idx):
+        """Insère (score, idx) dans le tas-min et remonte l'élément."""
+        pos = size
+        heap_s[pos] = score
+        heap_i[pos] = idx
+        while pos > 0:
+            parent = (pos - 1) // 2
+            if heap_s[parent] <= heap_s[pos]:
+                break
+            heap_s[parent], heap_s[pos] = heap_s[pos], heap_s[parent]
+            heap_i[parent], heap_i[pos] = heap_i[pos], heap_i[parent]
+            pos = parent
+
+    @njit(cache=True, nogil=True)
+    def _heap_replace_min(heap_s, heap_i, size, score, idx):
+        """Remplace la racine du tas-min et redescend l'élément."""
+        heap_s[0] = score
+        heap_i[0] = idx
+        pos = 0
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap_s[child + 1] < heap_s[child]:
+                child += 1
+            if heap_s[child] >= heap_s[pos]:
+                break
+            heap_s[child], heap_s[pos] = heap_s[pos], heap_s[child]
+            heap_i[child], heap_i[pos] = heap_i[pos], heap_i[child]
+            pos = child
+
+    @njit(parallel=True, cache=True)
+    def _topk_kernel(scores, k, n_chunks):
+        """Top-k parallèle : un tas par tranche de `scores`, fusion séquentielle."""
+        n = scores.shape[0]
+        chunk_size = (n + n_chunks - 1) // n_chunks
+        cand_s = np.full(n_chunks * k, -np.inf)
+        cand_i = np.full(n_chunks * k, -1, dtype=np.int64)
+
+        for c in prange(n_chunks):
+            start = c * chunk_size
+            stop = min(start + chunk_size, n)
+            heap_s = cand_s[c * k : (c + 1) * k]
+            heap_i = cand_i[c * k : (c + 1) * k]
+            size = 0
+            for j in range(start, stop):
+                score = scores[j]
+                if size < k:
+                    _heap_push(heap_s, heap_i, size, score, j)
+                    size += 1
+                elif score > heap_s[0]:
+                    _heap_replace_min(heap_s, heap_i, size, score, j)
+
+        valid = np.where(cand_i >= 0)[0]
+        merged_s = cand_s[valid]
+        merged_i = cand_i[valid]
+        order = np.argsort(-merged_s)[:k]
+        return merged_i[order]
+
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _best_match_kernel(matrix, count, top_ks, top_k, query):
+        """Ligne de meilleur produit scalaire parmi celles de même top_k."""
+        best = -1
+        best_s = -np.inf
+        dim = matrix.shape[1]
+        for i in range(count):
+            if top_ks[i] != top_k:
+                continue
+            s = 0.0
+            for j in range(dim):
+                s += matrix[i, j] * query[j]
+            if s > best_s:
+                best_s = s
+                best = i
+        return best, best_s
+
+
+def topk(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Retourne les indices des k meilleurs scores, triés par score décroissant.
+
+    Args:
+        scores: Vecteur de scores (1D)
+        k: Nombre d'indices à retourner
+
+    Returns:
+        Tableau d'indices (int64) de taille min(k, len(scores))
+    """
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    k = min(k, n)
+
+    if NUMBA_AVAILABLE:
+        n_chunks = max(1, min(get_num_threads(), n // k))
+        return _topk_kernel(np.ascontiguousarray(scores, dtype=np.float64), k, n_chunks)
+
+    if k == n:
+        return np.argsort(scores)[::-1]
+    candidates = np.argpartition(scores, n - k)[n - k :]
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+def best_match(
+    matrix: np.ndarray,
+    count: int,
+    top_ks: np.ndarray,
+    top_k: int,
+    query: np.ndarray,
+) -> tuple[int, float]:
+    """
+    Cherche la ligne de `matrix` la plus similaire à `query`.
+
+    Les lignes et `query` sont supposées normalisées (produit scalaire =
+    similarité cosinus). Seules les `count` premières lignes dont `top_ks`
+    vaut `top_k` sont candidates.
+
+    Args:
+        matrix: Matrice (n, dim) float32 des embeddings
+        count: Nombre de lignes occupées
+        top_ks: top_k associé à chaque ligne (int32)
+        top_k: top_k recherché
+        query: Vecteur requête (dim,) float32
+
+    Returns:
+        Tuple (indice, similarité), indice = -1 si aucune ligne candidate
+    """
+    if count == 0:
+        return -1, -np.inf
+
+    if NUMBA_AVAILABLE:
+        best, score = _best_match_kernel(matrix, count, top_ks, top_k, query)
+        return int(best), float(score)
+
+    scores = matrix[:count] @ query
+    scores[top_ks[:count] != top_k] = -np.inf
+    best = int(np.argmax(scores))
+    if scores[best] == -np.inf:
+        return -1, -np.inf
+    return best, float(scores[best])
+
+
+def warmup() -> None:
+    """
+    Compile les kernels Numba avec des données factices.
+
+    Appelé au chargement des index pour que la première vraie requête ne paie
+    pas la latence de compilation JIT (~1s). Sans effet si Numba est absent.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    topk(np.zeros(64, dtype=np.float64), 4)
+    best_match(
+        np.zeros((4, 8), dtype=np.float32),
+        4,
+        np.zeros(4, dtype=np.int32),
+        0,
+        np.zeros(8, dtype=np.float32),
+    )
+    logger.debug("Kernels Numba compilés")
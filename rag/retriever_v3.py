@@ -15,11 +15,13 @@ Features V3+ :
 import os
 import pickle
 import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-
-import numpy as np
 from pathlib import Path
+from typing import Any, NamedTuple
 
 # Import configuration (must be before logging_config to avoid circular imports)
 from config import (
@@ -31,6 +33,7 @@ from config import (
 
 # Use centralized logging configuration
 from logging_config import setup_logging
+from retriever_numba import topk, warmup as _warmup_topk
 
 logger = setup_logging(__name__)
 
@@ -78,6 +81,36 @@ _ollama_limiter = RateLimiter(
 
 
 # ── Input Validation ───────────────────────────────────────────────────────
+# Patterns compiled once at import: validate_query runs on every user turn
+_QUERY_DANGEROUS_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE | re.DOTALL), description)
+    for pattern, description in [
+        (r"<script[^>]*>.*?</script>", "script tags"),
+        (r"javascript:", "javascript protocol"),
+        (r"{{.*}}", "template injection"),
+        (r"<[^>]*>", "HTML tags"),
+    ]
+]
+
+_FILTER_SOURCE_DANGEROUS_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), description)
+    for pattern, description in [
+        (r"\$where", "MongoDB $where operator"),
+        (r"\$ne", "MongoDB inequality operator"),
+        (r"\$gt|\$lt|\$gte|\$lte", "MongoDB comparison operators"),
+        (r"\$in|\$nin", "MongoDB array operators"),
+        (r"\$or|\$and|\$not", "MongoDB logical operators"),
+        (r"\$regex|\$expr", "MongoDB regex/expression operators"),
+        (r"__proto__|__defineGetter__|constructor", "JavaScript prototype pollution"),
+        (r"eval\(|Function\(", "JavaScript eval/Function"),
+        (r"<script[^>]*>", "script tags"),
+        (r"javascript:", "javascript protocol"),
+    ]
+]
+
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+
 def validate_query(query: str, max_length: int = None) -> str:
     """
     Validate and sanitize user query before processing.
@@ -105,22 +138,15 @@ def validate_query(query: str, max_length: int = None) -> str:
         raise ValueError("Query contains no valid content")
 
     # Reject potentially dangerous patterns (prompt injection, XSS, etc.)
-    dangerous_patterns = [
-        (r"<script[^>]*>.*?</script>", "script tags"),
-        (r"javascript:", "javascript protocol"),
-        (r"{{.*}}", "template injection"),
-        (r"<[^>]*>", "HTML tags"),
-    ]
-
-    for pattern, description in dangerous_patterns:
-        if re.search(pattern, query, re.IGNORECASE | re.DOTALL):
+    for pattern, description in _QUERY_DANGEROUS_PATTERNS:
+        if pattern.search(query):
             logger.warning(
                 "Query contains potentially dangerous content: %s", description
             )
             raise ValueError(f"Query rejected: {description} detected")
 
     # Remove control characters except newlines and tabs
-    query = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", query)
+    query = _CONTROL_CHARS_RE.sub("", query)
 
     if not query.strip():
         raise ValueError("Query contains no valid content after sanitization")
@@ -159,21 +185,8 @@ def validate_filter_source(
         return None
 
     # Check for potentially dangerous patterns (SQL injection, NoSQL injection, etc.)
-    dangerous_patterns = [
-        (r"\$where", "MongoDB $where operator"),
-        (r"\$ne", "MongoDB inequality operator"),
-        (r"\$gt|\$lt|\$gte|\$lte", "MongoDB comparison operators"),
-        (r"\$in|\$nin", "MongoDB array operators"),
-        (r"\$or|\$and|\$not", "MongoDB logical operators"),
-        (r"\$regex|\$expr", "MongoDB regex/expression operators"),
-        (r"__proto__|__defineGetter__|constructor", "JavaScript prototype pollution"),
-        (r"eval\(|Function\(", "JavaScript eval/Function"),
-        (r"<script[^>]*>", "script tags"),
-        (r"javascript:", "javascript protocol"),
-    ]
-
-    for pattern, description in dangerous_patterns:
-        if re.search(pattern, filter_source, re.IGNORECASE):
+    for pattern, description in _FILTER_SOURCE_DANGEROUS_PATTERNS:
+        if pattern.search(filter_source):
             logger.warning(
                 "filter_source contains potentially dangerous content: %s", description
             )
@@ -394,12 +407,15 @@ SECTION_HINTS = {
 }
 
 
+_SECTION_HINT_RE = re.compile(r"(?:section|chapitre)\s*(\d+(?:\.\d+)?)")
+
+
 def extract_section_hints(query: str) -> list[str] | None:
     """Extrait les sections HAProxy probables."""
     query_lower = query.lower()
     hints = set()
 
-    match = re.search(r"(?:section|chapitre)\s*(\d+(?:\.\d+)?)", query_lower)
+    match = _SECTION_HINT_RE.search(query_lower)
     if match:
         section = match.group(1)
         if "." not in section:
@@ -586,40 +602,40 @@ def expand_query(query: str) -> list[str]:
     return list(expanded)
 
 
-# Singletons
-_chroma_collection = None
-_bm25 = None
-_chunks = None
-_reranker = None
-_allowed_sources: set[str] | None = None
+class _Indexes(NamedTuple):
+    """Index charges, publies ensemble (un seul objet) pour rester coherents."""
 
+    collection: Any
+    bm25: Any
+    chunks: list[dict]
+    allowed_sources: set[str]
 
-def _get_allowed_sources() -> set[str]:
-    """Extract unique source values from loaded chunks for validation."""
-    global _allowed_sources
-    if _allowed_sources is not None:
-        return _allowed_sources
 
-    if _chunks is None:
-        return set()
+# Singletons
+_indexes: _Indexes | None = None
+_reranker = None
+_index_lock = threading.Lock()
 
-    _allowed_sources = set()
-    for chunk in _chunks:
-        source = chunk.get("source")
-        if source and isinstance(source, str):
-            _allowed_sources.add(source)
 
-    logger.debug("Extracted %d unique sources from chunks", len(_allowed_sources))
-    return _allowed_sources
+def _load_indexes() -> _Indexes:
+    """
+    Charge les index V3+ (thread-safe, une seule fois par processus).
 
+    Returns:
+        Index courants. Un retrieval garde cet objet du debut a la fin :
+        les ids de ChromaDB/BM25 correspondent toujours a ses chunks, meme
+        si `reload_indexes` publie de nouveaux index entre-temps.
+    """
+    indexes = _indexes
+    if indexes is not None:
+        return indexes
 
-def _load_indexes():
-    """Charge les index V3+."""
-    global _chroma_collection, _bm25, _chunks, _reranker
+    with _index_lock:
+        return _load_indexes_locked()
 
-    if _chroma_collection is not None:
-        return
 
+def _read_indexes() -> _Indexes:
+    """Lit les index depuis le disque, sans toucher aux singletons."""
     if not CHROMA_DIR.exists():
         raise FileNotFoundError(
             f"Index V3 manquant : {CHROMA_DIR}\nLance 03_indexing.py"
@@ -637,12 +653,32 @@ def _load_indexes():
         path=str(CHROMA_DIR),
         settings=Settings(anonymized_telemetry=False),
     )
-    _chroma_collection = client.get_collection(CHROMA_COLLECTION)
+    collection = client.get_collection(CHROMA_COLLECTION)
 
     with open(BM25_PATH, "rb") as f:
-        _bm25 = pickle.load(f)
+        bm25 = pickle.load(f)
     with open(CHUNKS_PKL, "rb") as f:
-        _chunks = pickle.load(f)
+        chunks = pickle.load(f)
+
+    allowed_sources = set()
+    for chunk in chunks:
+        source = chunk.get("source")
+        if source and isinstance(source, str):
+            allowed_sources.add(source)
+    logger.debug("Extracted %d unique sources from chunks", len(allowed_sources))
+
+    return _Indexes(collection, bm25, chunks, allowed_sources)
+
+
+def _load_indexes_locked() -> _Indexes:
+    """Chargement effectif des index, appele sous `_index_lock`."""
+    global _indexes, _reranker
+
+    # Un autre thread a pu terminer le chargement pendant l'attente du verrou
+    if _indexes is not None:
+        return _indexes
+
+    indexes = _read_indexes()
 
     if FLASHRANK_AVAILABLE:
         import tempfile
@@ -653,18 +689,225 @@ def _load_indexes():
             model_name="ms-marco-MiniLM-L-12-v2", cache_dir=str(cache_dir)
         )
 
+    # Compile le top-k BM25 maintenant plutot qu'a la premiere requete
+    _warmup_topk()
+
+    # Publie les index en dernier : `_load_indexes` les teste sans verrou
+    _indexes = indexes
+
     logger.info(
-        f"✅ Index V3+ charges : {len(_chunks)} chunks | ChromaDB: {_chroma_collection.count()} docs"
+        "✅ Index V3+ charges : %d chunks | ChromaDB: %d docs",
+        len(indexes.chunks),
+        indexes.collection.count(),
     )
+    return indexes
+
+
+def reload_indexes() -> None:
+    """
+    Recharge les index depuis le disque (apres un 03_indexing.py), puis
+    invalide le cache de retrieval du processus.
+
+    Les nouveaux index sont lus a part puis publies d'un coup : les
+    retrievals en cours terminent sur les index qu'ils ont commence a
+    utiliser, et en cas d'erreur de lecture les index precedents (et le
+    cache) restent en place.
+    """
+    global _indexes
+
+    # Import differe : retrieval_cache importe ce module
+    from retrieval_cache import invalidate_retrieval_cache
+
+    with _index_lock:
+        if _indexes is None:
+            indexes = _load_indexes_locked()
+        else:
+            indexes = _read_indexes()
+            _indexes = indexes
+
+    invalidate_retrieval_cache()
+    logger.info(
+        "✅ Index V3+ recharges : %d chunks | ChromaDB: %d docs",
+        len(indexes.chunks),
+        indexes.collection.count(),
+    )
+
+
+def index_fingerprint() -> str:
+    """
+    Empreinte des index sur disque (modele d'embedding + taille/mtime des pickles).
+
+    Change a chaque reconstruction des index : sert a invalider les caches
+    de resultats (cf. retrieval_cache.py).
+    """
+    parts = [EMBED_MODEL]
+    for path in (BM25_PATH, CHUNKS_PKL):
+        try:
+            stat = path.stat()
+            parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path.name}:missing")
+    return "|".join(parts)
+
+
+# ── Cache LRU des embeddings de requêtes ─────────────────────────────────────
+# Les requêtes répétées (exemples de l'UI, reformulations, benchmarks) ne
+# repassent pas par Ollama : un appel qwen3-embedding:8b coûte ~100-500 ms.
+_embedding_cache: OrderedDict[str, list[float]] = OrderedDict()
+_embedding_cache_lock = threading.Lock()
 
 
 def _get_embedding(text: str, max_retries: int = None) -> list[float] | None:
+    """
+    Embedding d'une requête avec cache LRU en mémoire.
+
+    Args:
+        text: Text to embed
+        max_retries: Maximum number of retry attempts (default: from config)
+
+    Returns:
+        Embedding vector or None if all retries failed (None n'est pas mis en cache)
+    """
+    max_size = retrieval_config.embedding_cache_size
+    if max_size <= 0:
+        return _request_embedding(text, max_retries)
+
+    with _embedding_cache_lock:
+        embedding = _embedding_cache.get(text)
+        if embedding is not None:
+            _embedding_cache.move_to_end(text)
+            return embedding
+
+    embedding = _request_embedding(text, max_retries)
+    if embedding is None:
+        return None
+
+    with _embedding_cache_lock:
+        _embedding_cache[text] = embedding
+        _embedding_cache.move_to_end(text)
+        while len(_embedding_cache) > max_size:
+            _embedding_cache.popitem(last=False)
+
+    return embedding
+
+
+def _get_embeddings(texts: list[str]) -> list[list[float] | None]:
+    """
+    Embeddings de plusieurs requêtes en un seul aller-retour logique.
+
+    Les requêtes absentes du cache sont envoyées en parallèle sur la session
+    HTTP poolée et ne consomment qu'un seul créneau du rate limiter.
+    `/api/embed` (batch natif) n'est pas utilisé : il normalise les vecteurs,
+    ce qui changerait les distances L2 de l'index construit avec
+    `/api/embeddings`.
+
+    Args:
+        texts: Textes à encoder
+
+    Returns:
+        Liste d'embeddings alignée sur `texts` (None en cas d'échec)
+    """
+    max_size = retrieval_config.embedding_cache_size
+    results: list[list[float] | None] = [None] * len(texts)
+    missing: dict[str, list[int]] = {}
+
+    with _embedding_cache_lock:
+        for i, text in enumerate(texts):
+            embedding = _embedding_cache.get(text) if max_size > 0 else None
+            if embedding is not None:
+                _embedding_cache.move_to_end(text)
+                results[i] = embedding
+            else:
+                missing.setdefault(text, []).append(i)
+
+    if not missing:
+        return results
+
+    _ollama_limiter.wait_if_needed()
+    with ThreadPoolExecutor(max_workers=min(len(missing), 8)) as pool:
+        fetched = pool.map(
+            lambda text: _request_embedding(text, rate_limit=False), list(missing)
+        )
+        fetched = dict(zip(missing, fetched, strict=True))
+
+    with _embedding_cache_lock:
+        for text, embedding in fetched.items():
+            for i in missing[text]:
+                results[i] = embedding
+            if embedding is not None and max_size > 0:
+                _embedding_cache[text] = embedding
+                _embedding_cache.move_to_end(text)
+        while len(_embedding_cache) > max(max_size, 0):
+            _embedding_cache.popitem(last=False)
+
+    return results
+
+
+def embed_query(query: str) -> list[float] | None:
+    """
+    Embedding d'une requete utilisateur, validee comme dans `retrieve`.
+
+    Passe par le meme cache LRU que `retrieve` : l'appel suivant a `retrieve`
+    pour la meme requete ne refait pas d'aller-retour Ollama.
+
+    Returns:
+        Embedding ou None (requete invalide ou Ollama indisponible)
+    """
+    try:
+        query = validate_query(query)
+    except ValueError:
+        return None
+    return _get_embedding(query)
+
+
+def embed_queries(queries: list[str]) -> list[list[float] | None]:
+    """
+    Embeddings de plusieurs requetes utilisateur en un seul lot.
+
+    Version batch de `embed_query` (meme validation, meme cache LRU) : les
+    appels suivants a `retrieve` pour ces requetes ne refont pas
+    d'aller-retour Ollama.
+
+    Returns:
+        Liste alignee sur `queries` (None : requete invalide ou echec)
+    """
+    validated: list[str | None] = []
+    for query in queries:
+        try:
+            validated.append(validate_query(query))
+        except ValueError:
+            validated.append(None)
+
+    valid = [query for query in validated if query is not None]
+    embeddings = iter(_get_embeddings(valid) if valid else [])
+    return [next(embeddings) if query is not None else None for query in validated]
+
+
+def warmup_embedding_model() -> bool:
+    """
+    Charge le modèle d'embedding en mémoire Ollama (requête factice, non cachée).
+
+    Returns:
+        True si le modèle a répondu
+    """
+    if _request_embedding("warmup", max_retries=1) is None:
+        logger.warning("Prechargement du modele d'embedding %s impossible", EMBED_MODEL)
+        return False
+    logger.info("Modele d'embedding %s precharge", EMBED_MODEL)
+    return True
+
+
+def _request_embedding(
+    text: str, max_retries: int = None, rate_limit: bool = True
+) -> list[float] | None:
     """
     Embedding via qwen3-embedding:8b with retry logic and rate limiting.
 
     Args:
         text: Text to embed
         max_retries: Maximum number of retry attempts (default: from config)
+        rate_limit: Consume a rate limiter slot (False when the caller already
+            did it for a whole batch)
 
     Returns:
         Embedding vector or None if all retries failed
@@ -675,7 +918,8 @@ def _get_embedding(text: str, max_retries: int = None) -> list[float] | None:
     for attempt in range(max_retries):
         try:
             # Wait if needed to respect rate limit
-            _ollama_limiter.wait_if_needed()
+            if rate_limit:
+                _ollama_limiter.wait_if_needed()
 
             with _retriever_session.post(
                 f"{OLLAMA_URL}/api/embeddings",
@@ -719,10 +963,13 @@ def _get_embedding(text: str, max_retries: int = None) -> list[float] | None:
     return None
 
 
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9\-\.]*[a-z0-9]|[a-z0-9]")
+
+
 def _tokenize(text: str) -> list[str]:
     """Tokenisation pour BM25."""
     text = text.lower()
-    tokens = re.findall(r"[a-z0-9][a-z0-9\-\.]*[a-z0-9]|[a-z0-9]", text)
+    tokens = _TOKEN_RE.findall(text)
     stopwords = {
         "le",
         "la",
@@ -758,32 +1005,40 @@ def _tokenize(text: str) -> list[str]:
 
 
 def _chroma_search(
-    query_embedding: list[float], top_k: int, query_text: str = ""
+    collection, query_embedding: list[float], top_k: int, query_text: str = ""
 ) -> list[tuple[int, float]]:
     """Recherche vectorielle ChromaDB SANS filtrage (boosting dans rerank)."""
     # Pas de filtrage restrictif - on recupere tous les candidats
     # Le category boosting sera fait dans le reranking
     # Note: query_text is kept for API compatibility but not used in V3+
+    return _chroma_search_batch(collection, [query_embedding], top_k)[0]
 
-    results = _chroma_collection.query(
-        query_embeddings=[query_embedding],
-        n_results=min(top_k * 2, _chroma_collection.count()),
-        include=["distances", "metadatas"],
-    )
-
-    ids = results["ids"][0]
-    distances = results["distances"][0]
 
-    output = []
-    for chroma_id, dist in zip(ids, distances):
-        chunk_idx = int(chroma_id.replace("chunk_", ""))
-        similarity = 1.0 - dist
-        output.append((chunk_idx, similarity))
+def _chroma_search_batch(
+    collection,
+    query_embeddings: list[list[float]],
+    top_k: int,
+    filter_source: str | None = None,
+) -> list[list[tuple[int, float]]]:
+    """Recherche vectorielle ChromaDB pour plusieurs requetes en un seul appel."""
+    filters = {"where": {"source": filter_source}} if filter_source else {}
+    results = collection.query(
+        query_embeddings=query_embeddings,
+        n_results=min(top_k * 2, collection.count()),
+        include=["distances"],
+        **filters,
+    )
 
-    return output
+    return [
+        [
+            (int(chroma_id.replace("chunk_", "")), 1.0 - dist)
+            for chroma_id, dist in zip(ids, distances, strict=True)
+        ]
+        for ids, distances in zip(results["ids"], results["distances"], strict=True)
+    ]
 
 
-def _bm25_search(query: str, top_k: int) -> list[tuple[int, float]]:
+def _bm25_search(bm25, query: str, top_k: int) -> list[tuple[int, float]]:
     """Recherche BM25 avec query expansion."""
     original_tokens = _tokenize(query)
     expanded_tokens = expand_query(query)
@@ -794,8 +1049,8 @@ def _bm25_search(query: str, top_k: int) -> list[tuple[int, float]]:
     if not all_tokens:
         return []
 
-    scores = _bm25.get_scores(all_tokens)
-    top_indices = np.argsort(scores)[::-1][:top_k]
+    scores = bm25.get_scores(all_tokens)
+    top_indices = topk(scores, top_k)
     return [(int(idx), float(scores[idx])) for idx in top_indices if scores[idx] > 0]
 
 
@@ -805,13 +1060,19 @@ def _reciprocal_rank_fusion(
     k: int = RRF_K,
 ) -> list[tuple[int, float]]:
     """Fusion RRF."""
-    rrf_scores: dict[int, float] = {}
+    return _reciprocal_rank_fusion_multi([chroma_results, bm25_results], k=k)
 
-    for rank, (chunk_id, _) in enumerate(chroma_results):
-        rrf_scores[chunk_id] = rrf_scores.get(chunk_id, 0.0) + 1.0 / (k + rank + 1)
 
-    for rank, (chunk_id, _) in enumerate(bm25_results):
-        rrf_scores[chunk_id] = rrf_scores.get(chunk_id, 0.0) + 1.0 / (k + rank + 1)
+def _reciprocal_rank_fusion_multi(
+    rankings: list[list[tuple[int, float]]],
+    k: int = RRF_K,
+) -> list[tuple[int, float]]:
+    """Fusion RRF d'un nombre quelconque de classements."""
+    rrf_scores: dict[int, float] = {}
+
+    for ranking in rankings:
+        for rank, (chunk_id, _) in enumerate(ranking):
+            rrf_scores[chunk_id] = rrf_scores.get(chunk_id, 0.0) + 1.0 / (k + rank + 1)
 
     return sorted(rrf_scores.items(), key=lambda x: x[1], reverse=True)
 
@@ -1020,7 +1281,8 @@ def retrieve(
     filter_source: str | None = None,
 ) -> dict:
     """Pipeline complet retrieval V3+."""
-    _load_indexes()
+    indexes = _load_indexes()
+    chunks = indexes.chunks
 
     # Validate and sanitize query
     try:
@@ -1042,8 +1304,9 @@ def retrieve(
     # Validate and sanitize filter_source before using in ChromaDB query
     if filter_source:
         try:
-            allowed_sources = _get_allowed_sources()
-            filter_source = validate_filter_source(filter_source, allowed_sources)
+            filter_source = validate_filter_source(
+                filter_source, indexes.allowed_sources
+            )
         except ValueError as e:
             logger.error("filter_source validation failed: %s", e)
             return {
@@ -1055,9 +1318,9 @@ def retrieve(
             }
 
     if filter_source:
-        chroma_results_raw = _chroma_collection.query(
+        chroma_results_raw = indexes.collection.query(
             query_embeddings=[query_emb],
-            n_results=min(TOP_K_RETRIEVAL, _chroma_collection.count()),
+            n_results=min(TOP_K_RETRIEVAL, indexes.collection.count()),
             where={"source": filter_source},
             include=["distances", "metadatas"],
         )
@@ -1065,37 +1328,39 @@ def retrieve(
         distances = chroma_results_raw["distances"][0]
         chroma_results = [
             (int(cid.replace("chunk_", "")), 1.0 - dist)
-            for cid, dist in zip(ids, distances)
+            for cid, dist in zip(ids, distances, strict=True)
         ]
     else:
-        chroma_results = _chroma_search(query_emb, TOP_K_RETRIEVAL, query_text=query)
+        chroma_results = _chroma_search(
+            indexes.collection, query_emb, TOP_K_RETRIEVAL, query_text=query
+        )
 
     if verbose:
         print("\n[ChromaDB V3+] top-5 :")
         for rank, (cid, score) in enumerate(chroma_results[:5]):
-            chunk = _chunks[cid]
+            chunk = chunks[cid]
             ia_cat = chunk.get("ia_category", "N/A")
             print(
-                f"   [{rank + 1}] sim={score:.3f} | cat={ia_cat} | {_chunks[cid]['title'][:50]}"
+                f"   [{rank + 1}] sim={score:.3f} | cat={ia_cat} | {chunks[cid]['title'][:50]}"
             )
 
-    bm25_results = _bm25_search(query, TOP_K_RETRIEVAL)
+    bm25_results = _bm25_search(indexes.bm25, query, TOP_K_RETRIEVAL)
 
     if verbose:
         print("\n[BM25 V3+] top-5 (query expansion):")
         for rank, (cid, score) in enumerate(bm25_results[:5]):
-            print(f"   [{rank + 1}] score={score:.3f} | {_chunks[cid]['title'][:50]}")
+            print(f"   [{rank + 1}] score={score:.3f} | {chunks[cid]['title'][:50]}")
 
     rrf_results = _reciprocal_rank_fusion(chroma_results, bm25_results)[:TOP_K_RRF]
 
     if verbose:
         print("\n[RRF V3+] top-5 :")
         for rank, (cid, score) in enumerate(rrf_results[:5]):
-            print(f"   [{rank + 1}] rrf={score:.4f} | {_chunks[cid]['title'][:50]}")
+            print(f"   [{rank + 1}] rrf={score:.4f} | {chunks[cid]['title'][:50]}")
 
     candidates = []
     for chunk_id, rrf_score in rrf_results:
-        chunk = _chunks[chunk_id].copy()
+        chunk = chunks[chunk_id].copy()
         chunk["rrf_score"] = rrf_score
         chunk["chunk_id"] = chunk_id
         candidates.append(chunk)
@@ -1136,13 +1401,96 @@ def retrieve(
     }
 
 
-def retrieve_context_string(
-    query: str,
+def retrieve_multi(
+    queries: list[str],
     top_k: int = TOP_K_RERANK,
     filter_source: str | None = None,
-) -> tuple[str, list[dict], bool]:
-    """Helper : retourne contexte formate pour LLM + sources."""
-    result = retrieve(query, top_k=top_k, filter_source=filter_source)
+) -> dict:
+    """
+    Retrieval multi-requetes (reformulations / query expansion).
+
+    Un seul lot d'embeddings, une seule requete ChromaDB pour toutes les
+    reformulations, puis fusion RRF des 2N classements (vector + BM25 par
+    requete). Le reranking utilise la premiere requete (question originale).
+    `filter_source` restreint la recherche vectorielle, comme dans `retrieve`.
+    """
+    indexes = _load_indexes()
+    chunks = indexes.chunks
+
+    valid_queries = []
+    for query in queries:
+        try:
+            valid_queries.append(validate_query(query))
+        except ValueError as e:
+            logger.warning("Sub-query ignored (%s): %r", e, query)
+
+    if not valid_queries:
+        return {"chunks": [], "low_confidence": True, "query": "", "best_score": 0.0}
+
+    main_query = valid_queries[0]
+
+    if filter_source:
+        try:
+            filter_source = validate_filter_source(
+                filter_source, indexes.allowed_sources
+            )
+        except ValueError as e:
+            logger.error("filter_source validation failed: %s", e)
+            return {
+                "chunks": [],
+                "low_confidence": True,
+                "query": main_query,
+                "best_score": 0.0,
+                "error": str(e),
+            }
+
+    embeddings = _get_embeddings(valid_queries)
+    embedded = [e for e in embeddings if e is not None]
+    if not embedded:
+        return {
+            "chunks": [],
+            "low_confidence": True,
+            "query": main_query,
+            "best_score": 0.0,
+        }
+
+    # Requetes sans embedding (echec Ollama) : seulement leur classement BM25
+    rankings = _chroma_search_batch(
+        indexes.collection, embedded, TOP_K_RETRIEVAL, filter_source=filter_source
+    )
+    rankings.extend(_bm25_search(indexes.bm25, q, TOP_K_RETRIEVAL) for q in valid_queries)
+
+    rrf_results = _reciprocal_rank_fusion_multi(rankings)[:TOP_K_RRF]
+
+    candidates = []
+    for chunk_id, rrf_score in rrf_results:
+        chunk = chunks[chunk_id].copy()
+        chunk["rrf_score"] = rrf_score
+        chunk["chunk_id"] = chunk_id
+        candidates.append(chunk)
+
+    final = _rerank(main_query, candidates)[:top_k]
+
+    best_score = final[0].get("rerank_score", 0) if final else 0.0
+    low_confidence = best_score < CONFIDENCE_THRESHOLD
+
+    logger.debug(
+        "Score V3+ multi (%d requetes): %.4f | low_confidence=%s",
+        len(valid_queries),
+        best_score,
+        low_confidence,
+    )
+
+    return {
+        "chunks": final,
+        "low_confidence": low_confidence,
+        "best_score": best_score,
+        "query": main_query,
+    }
+
+
+def _format_context(result: dict) -> tuple[str, list[dict], bool]:
+    """Formate le resultat de retrieval en (contexte LLM, sources, low_confidence)."""
     chunks = result["chunks"]
 
     if not chunks:
@@ -1171,6 +1519,26 @@ def retrieve_context_string(
     return context_str, sources, result["low_confidence"]
 
 
+def retrieve_context_string(
+    query: str,
+    top_k: int = TOP_K_RERANK,
+    filter_source: str | None = None,
+) -> tuple[str, list[dict], bool]:
+    """Helper : retourne contexte formate pour LLM + sources."""
+    return _format_context(retrieve(query, top_k=top_k, filter_source=filter_source))
+
+
+def retrieve_context_strings(
+    queries: list[str],
+    top_k: int = TOP_K_RERANK,
+    filter_source: str | None = None,
+) -> tuple[str, list[dict], bool]:
+    """Helper multi-requetes : comme `retrieve_context_string` via `retrieve_multi`."""
+    return _format_context(
+        retrieve_multi(queries, top_k=top_k, filter_source=filter_source)
+    )
+
+
 if __name__ == "__main__":
     import sys
 
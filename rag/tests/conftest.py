@@ -0,0 +1,7 @@
+"""Fixtures pytest pour les tests du RAG principal."""
+
+import sys
+from pathlib import Path
+
+# Les modules de rag/ s'importent par leur nom (scripts lancés depuis rag/)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,68 @@
+"""Tests du micro-batcher d'embeddings du chatbot."""
+
+import asyncio
+import sys
+import types
+
+import pytest
+import pytest_asyncio
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Remplace retriever_v3.embed_queries et enregistre les lots reçus."""
+    calls = []
+
+    def embed_queries(queries):
+        calls.append(list(queries))
+        if "boom" in queries:
+            raise RuntimeError("Ollama indisponible")
+        return [[float(len(query))] for query in queries]
+
+    retriever = types.ModuleType("retriever_v3")
+    retriever.embed_queries = embed_queries
+    monkeypatch.setitem(sys.modules, "retriever_v3", retriever)
+    return calls
+
+
+@pytest_asyncio.fixture
+async def batcher():
+    batcher = EmbeddingBatcher(max_batch_size=8, max_latency=0.05)
+    yield batcher
+    if batcher._worker is not None:
+        batcher._worker.cancel()
+    batcher._executor.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_embeds_share_one_batch(batcher, batches):
+    results = await asyncio.gather(
+        batcher.embed("a"), batcher.embed("bb"), batcher.embed("ccc")
+    )
+
+    assert batches == [["a", "bb", "ccc"]]
+    assert results == [[1.0], [2.0], [3.0]]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_batch_size(batcher, batches):
+    batcher.max_batch_size = 2
+
+    results = await asyncio.gather(*(batcher.embed(q) for q in ("a", "bb", "ccc")))
+
+    assert batches == [["a", "bb"], ["ccc"]]
+    assert results == [[1.0], [2.0], [3.0]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_raises_for_every_waiter(batcher, batches):
+    results = await asyncio.gather(
+        batcher.embed("boom"), batcher.embed("bb"), return_exceptions=True
+    )
+
+    assert batches == [["boom", "bb"]]
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    # Le worker survit à l'échec : le lot suivant passe normalement
+    assert await batcher.embed("ccc") == [3.0]
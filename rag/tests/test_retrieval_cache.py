@@ -0,0 +1,67 @@
+"""Tests du cache de retrieval (LRU mémoire + SQLite)."""
+
+import pytest
+from retrieval_cache import RetrievalCache
+
+RESULT = (
+    "[Source 1: timeout connect - https://docs.haproxy.org/3.2/configuration.html]",
+    [{"title": "timeout connect", "url": "https://docs.haproxy.org/3.2/configuration.html"}],
+    False,
+)
+
+
+@pytest.fixture
+def open_cache(tmp_path):
+    """Ouvre des caches sur la même base SQLite, fermés en fin de test."""
+    caches = []
+
+    def open_cache(fingerprint: str) -> RetrievalCache:
+        cache = RetrievalCache(fingerprint, db_path=tmp_path / "retrieval.sqlite")
+        caches.append(cache)
+        return cache
+
+    yield open_cache
+    for cache in caches:
+        cache.close()
+
+
+def test_memory_round_trip_normalizes_query(open_cache):
+    cache = open_cache("v1")
+    cache.put("Configurer  timeout connect", 5, RESULT)
+
+    assert cache.get("configurer timeout connect", 5) == RESULT
+    assert cache.get("configurer timeout connect", 3) is None
+    stats = cache.stats()
+    assert (stats["hits_memory"], stats["misses"]) == (1, 1)
+
+
+def test_disk_round_trip_survives_restart(open_cache):
+    open_cache("v1").put("timeout connect", 5, RESULT)
+
+    cache = open_cache("v1")
+
+    assert cache.contains("timeout connect", 5)
+    assert cache.get("timeout connect", 5) == RESULT
+    assert cache.stats()["hits_disk"] == 1
+    # Relu depuis le disque puis gardé en mémoire
+    assert cache.get("timeout connect", 5) == RESULT
+    assert cache.stats()["hits_memory"] == 1
+
+
+def test_new_fingerprint_hides_old_entries(open_cache):
+    open_cache("v1").put("timeout connect", 5, RESULT)
+
+    cache = open_cache("v2")
+
+    assert not cache.contains("timeout connect", 5)
+    assert cache.get("timeout connect", 5) is None
+
+
+def test_invalidate_switches_fingerprint(open_cache):
+    cache = open_cache("v1")
+    cache.put("timeout connect", 5, RESULT)
+
+    cache.invalidate("v2")
+
+    assert cache.get("timeout connect", 5) is None
+    assert cache.stats()["memory_size"] == 0
@@ -0,0 +1,138 @@
+"""Tests de retriever_v3 : rechargement des index et retrieval multi-requêtes."""
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+import retrieval_cache  # noqa: E402
+import retriever_v3  # noqa: E402
+
+
+def make_indexes(name: str) -> retriever_v3._Indexes:
+    """Index factices, reconnaissables à leur nom."""
+    return retriever_v3._Indexes(
+        collection=f"{name}-collection",
+        bm25=f"{name}-bm25",
+        chunks=[{"title": name, "source": name}],
+        allowed_sources={name},
+    )
+
+
+class FakeCollection:
+    def count(self) -> int:
+        return 1
+
+
+@pytest.fixture
+def invalidations(monkeypatch):
+    """Compte les appels à invalidate_retrieval_cache."""
+    calls = []
+    monkeypatch.setattr(
+        retrieval_cache, "invalidate_retrieval_cache", lambda: calls.append(True)
+    )
+    return calls
+
+
+def test_reload_swaps_indexes_and_invalidates_cache(monkeypatch, invalidations):
+    old = make_indexes("old")
+    new = make_indexes("new")._replace(collection=FakeCollection())
+    monkeypatch.setattr(retriever_v3, "_indexes", old)
+    monkeypatch.setattr(retriever_v3, "_read_indexes", lambda: new)
+
+    retriever_v3.reload_indexes()
+
+    assert retriever_v3._load_indexes() is new
+    assert invalidations == [True]
+
+
+def test_failed_reload_keeps_indexes_and_cache(monkeypatch, invalidations):
+    old = make_indexes("old")
+    monkeypatch.setattr(retriever_v3, "_indexes", old)
+
+    def fail():
+        raise FileNotFoundError("index_v3")
+
+    monkeypatch.setattr(retriever_v3, "_read_indexes", fail)
+
+    with pytest.raises(FileNotFoundError):
+        retriever_v3.reload_indexes()
+
+    assert retriever_v3._load_indexes() is old
+    assert invalidations == []
+
+
+@pytest.fixture
+def multi(monkeypatch):
+    """
+    retrieve_multi sur des index factices : embeddings, recherches et
+    reranking remplacés, appels enregistrés.
+    """
+    chunks = [{"title": f"chunk {i}", "source": "configuration"} for i in range(4)]
+    monkeypatch.setattr(
+        retriever_v3,
+        "_indexes",
+        retriever_v3._Indexes("collection", "bm25", chunks, {"configuration"}),
+    )
+    calls = {"chroma": [], "bm25": [], "embeddings": [[0.1], [0.2]]}
+
+    monkeypatch.setattr(
+        retriever_v3, "_get_embeddings", lambda queries: calls["embeddings"]
+    )
+
+    def chroma(collection, embeddings, top_k, filter_source=None):
+        calls["chroma"].append((embeddings, filter_source))
+        rankings = {0.1: [(0, 0.9), (1, 0.8)], 0.2: [(1, 0.9), (2, 0.8)]}
+        return [rankings[e[0]] for e in embeddings]
+
+    def bm25(index, query, top_k):
+        calls["bm25"].append(query)
+        return {"timeout connect": [(2, 5.0)], "health check": [(3, 2.0)]}[query]
+
+    monkeypatch.setattr(retriever_v3, "_chroma_search_batch", chroma)
+    monkeypatch.setattr(retriever_v3, "_bm25_search", bm25)
+    monkeypatch.setattr(retriever_v3, "_rerank", lambda query, candidates: candidates)
+    return calls
+
+
+def rrf(*ranks: int) -> float:
+    """Score RRF d'un chunk classé aux rangs donnés (0 = premier)."""
+    return sum(1.0 / (retriever_v3.RRF_K + rank + 1) for rank in ranks)
+
+
+def test_retrieve_multi_fuses_vector_and_bm25_rankings(multi):
+    result = retriever_v3.retrieve_multi(["timeout connect", "health check"], top_k=4)
+
+    # 2N classements : 2 vectoriels (un seul appel ChromaDB) + 2 BM25
+    assert multi["chroma"] == [([[0.1], [0.2]], None)]
+    assert multi["bm25"] == ["timeout connect", "health check"]
+    scores = {chunk["chunk_id"]: chunk["rrf_score"] for chunk in result["chunks"]}
+    assert scores == pytest.approx({1: rrf(1, 0), 2: rrf(1, 0), 0: rrf(0), 3: rrf(0)})
+    assert result["query"] == "timeout connect"
+
+
+def test_retrieve_multi_keeps_bm25_for_queries_without_embedding(multi):
+    multi["embeddings"] = [[0.1], None]
+
+    result = retriever_v3.retrieve_multi(["timeout connect", "health check"], top_k=4)
+
+    assert multi["chroma"] == [([[0.1]], None)]
+    assert multi["bm25"] == ["timeout connect", "health check"]
+    assert {chunk["chunk_id"] for chunk in result["chunks"]} == {0, 1, 2, 3}
+
+
+def test_retrieve_multi_without_any_embedding(multi):
+    multi["embeddings"] = [None, None]
+
+    result = retriever_v3.retrieve_multi(["timeout connect", "health check"])
+
+    assert result["chunks"] == []
+    assert result["low_confidence"] is True
+    assert multi["chroma"] == []
+
+
+def test_retrieve_multi_forwards_filter_source(multi):
+    retriever_v3.retrieve_multi(
+        ["timeout connect", "health check"], filter_source="configuration"
+    )
+
+    assert multi["chroma"] == [([[0.1], [0.2]], "configuration")]